@@ -5,6 +5,7 @@ import asyncio
 import sys
 import discord
 from firetail.core import bot, events
+from firetail.lib import db
 from firetail.utils import ExitCodes, logger
 
 
@@ -54,11 +55,22 @@ def parse_cli_args():
     parser = argparse.ArgumentParser(description="firetail - An EVE Online Discord Bot")
     parser.add_argument("--debug", "-d", help="Enable debug mode.", action="store_true")
     parser.add_argument("--launcher", "-l", help=argparse.SUPPRESS, action="store_true")
+    parser.add_argument(
+        "--enable-incremental-vacuum", action="store_true",
+        help="Rewrite the database so old rows' space can be freed while running, then exit. "
+             "Run while the bot is stopped."
+    )
     return parser.parse_args()
 
 
 def main():
     args = parse_cli_args()
+    if args.enable_incremental_vacuum:
+        if db.enable_incremental_vacuum():
+            print("Incremental vacuum enabled.")
+        else:
+            print("Incremental vacuum was already enabled.")
+        return
     asyncio.run(run_firetail(debug=args.debug, launcher=args.launcher))  # Use asyncio.run to handle the coroutine
 
 if __name__ == "__main__":
@@ -2,7 +2,6 @@ import os
 import sys
 import aiohttp
 import asyncio
-from aiohttp import ClientSession
 from collections import Counter
 from datetime import datetime
 from shutil import copyfile
@@ -11,6 +10,11 @@ from dateutil.relativedelta import relativedelta
 from discord.ext import commands
 
 from firetail.lib import ESI, db
+from firetail.lib.cache import DEFAULT_MAXSIZE, PERSISTENT_PATH, PersistentCache
+from firetail.lib.retention import INTERVAL as RETENTION_INTERVAL, Retention, policies_from_config
+from firetail.lib.sde import DEFAULT_PATH as SDE_PATH, StaticStore
+from firetail.lib.settings import Settings
+from firetail.lib.transport import Transport
 from firetail.utils import ExitCodes
 
 # Ensure the config file exists
@@ -43,7 +47,8 @@ class Firetail(commands.Bot):
         self.core_dir = os.path.dirname(os.path.realpath(__file__))
         self.config = config
         self.default_prefix = config.bot_prefix[0]
-        self.prefixes = {}
+        self.settings = Settings()
+        self.prefixes = self.settings.prefixes
         self.bot_users = []
         self.repeat_offender = []
         self.last_command = None
@@ -58,27 +63,67 @@ class Firetail(commands.Bot):
         kwargs["intents"] = discord.Intents.all()  # Full intents for all bot functionalities
 
         super().__init__(**kwargs)
-        self.session = None  # To be initialized asynchronously
+        self.transport = None  # To be initialized asynchronously
+        self.session = None
         self.esi_data = None
+        self.static_data = None
+        self.retention = None
+        self._retention_task = None
         self.debug = bool(kwargs["debug"])
 
     async def setup_hook(self):
         """Initialize asynchronous resources and setup the bot."""
-        self.session = ClientSession()
-        self.esi_data = ESI(self.session)
+        max_concurrency = getattr(config, 'esi_max_concurrency', 20)
+        self.transport = Transport({'esi': {'limit_per_host': max_concurrency}})
+        # general purpose session for upstreams without their own pool
+        self.session = self.transport.default
+        self.static_data = StaticStore.open(getattr(config, 'sde_path', SDE_PATH))
+        cache_path = getattr(config, 'esi_cache_path', PERSISTENT_PATH)
+        self.esi_data = ESI(
+            self.transport,
+            cache_size=getattr(config, 'esi_cache_size', DEFAULT_MAXSIZE),
+            max_concurrency=max_concurrency,
+            static=self.static_data,
+            persistent=PersistentCache(cache_path) if cache_path else None,
+            urls=getattr(config, 'upstream_urls', None),
+        )
+        if getattr(config, 'esi_cache_preload', True):
+            loaded = await self.esi_data.cache.warm()
+            if loaded:
+                self.logger.info(f'Preloaded {loaded} cached ESI responses')
+        await db.open_db(
+            readers=getattr(config, 'db_readers', db.READERS),
+            write_interval=getattr(config, 'db_write_interval', db.WRITE_INTERVAL * 1000) / 1000,
+            write_rows=getattr(config, 'db_write_rows', db.WRITE_ROWS),
+            url=getattr(config, 'database_url', None),
+            pool_size=getattr(config, 'database_pool_size', db.POOL_SIZE),
+            slow_query=getattr(config, 'db_slow_query_ms', db.SLOW_QUERY * 1000) / 1000,
+        )
         await self.load_db()
+        self.retention = Retention(
+            policies_from_config(getattr(config, 'retention_policies', None)),
+            getattr(config, 'retention_interval', RETENTION_INTERVAL),
+        )
+        self._retention_task = asyncio.create_task(self.retention.run())
 
     async def load_db(self):
-        """Load database and prefixes."""
+        """Load database and settings."""
         await db.create_tables()
-        data = await db.select("SELECT * FROM prefixes")
-        self.prefixes = dict(data)
+        await self.settings.load()
 
     async def shutdown(self, *, restart=False):
         """Shutdown the bot cleanly."""
         self._shutdown_mode = ExitCodes.RESTART if restart else ExitCodes.SHUTDOWN
-        if self.session:
-            await self.session.close()
+        if self.transport:
+            await self.transport.close()
+        if self.static_data:
+            self.static_data.close()
+        if self.esi_data and self.esi_data.cache.persistent:
+            await self.esi_data.cache.persistent.close()
+        if self._retention_task:
+            self._retention_task.cancel()
+        await db.flush()
+        await db.close_db()
         await self.logout()
 
     @discord.utils.cached_property
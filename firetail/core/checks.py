@@ -3,8 +3,6 @@ import time
 import discord
 from discord.ext import commands
 
-from firetail.lib import db
-
 
 async def check_is_owner(ctx):
     return await ctx.bot.is_owner(ctx.author)
@@ -106,15 +104,11 @@ async def check_spam(ctx):
 async def check_whitelist(ctx):
     if ctx.guild is None:
         return True
-    sql = "SELECT * FROM whitelist WHERE 'location_id' = (?)"
-    values = (ctx.channel.id,)
-    result = await db.select_var(sql, values)
-    if result is None or len(result) == 0:
+    roles = ctx.bot.settings.whitelist.get(ctx.channel.id)
+    if not roles:
+        return True
+    if any(user_role.id in roles for user_role in ctx.author.roles):
         return True
-    for role in result:
-        for user_role in ctx.author.roles:
-            if role[2] == user_role.id:
-                return True
     if ctx.guild is not None and ctx.channel.permissions_for(ctx.guild.me).manage_messages:
         await ctx.message.delete()
         await ctx.author.send('WARNING: You do not have the required roles to use commands in this channel. Feel free'
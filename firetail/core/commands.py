@@ -1,5 +1,6 @@
 import asyncio
 import functools
+import io
 import logging
 import textwrap
 from contextlib import suppress
@@ -132,6 +133,109 @@ class Core(commands.Cog):
         else:
             await ctx.success("Username set.")
 
+    @commands.command(name="esi")
+    @checks.is_co_owner()
+    async def esi_status(self, ctx):
+        """Show ESI error limit and request load"""
+        state = self.bot.esi_data.governor.state()
+        remaining = state['errors_remaining']
+        await ctx.info(
+            "ESI Status",
+            f"Errors Remaining: {'Unknown' if remaining is None else remaining}\n"
+            f"Window Resets In: {state['reset_in'] or 0}s\n"
+            f"Requests In Flight: {state['in_flight']}/{state['limit']}\n"
+            f"Paused For: {state['paused_for']}s\n"
+            f"Times Paused: {state['pauses']}"
+        )
+
+    @commands.command(name="esimetrics")
+    @checks.is_co_owner()
+    async def esi_metrics(self, ctx, export: str = None):
+        """Show ESI endpoint and cache stats
+
+        Use `esimetrics export` for all metrics in OpenMetrics format.
+        """
+        metrics = self.bot.esi_data.metrics
+        cache = self.bot.esi_data.cache
+        if export == 'export':
+            text = metrics.openmetrics(cache)
+            return await ctx.send(file=discord.File(io.BytesIO(text.encode()), filename='esi_metrics.txt'))
+
+        def endpoint_lines(endpoints):
+            return [
+                f"`{name}` {stats.requests} reqs, {stats.mean_latency * 1000:.0f}ms avg, {stats.bytes // 1024}KiB"
+                for name, stats in endpoints
+            ] or ['None']
+
+        groups = sorted(set(cache.group_hits) | set(cache.group_misses), key=lambda g: -cache.group_misses[g])
+        cache_lines = [
+            f"`{group}` {cache.group_hits[group]}/{cache.group_hits[group] + cache.group_misses[group]} hits, "
+            f"{cache.group_evictions[group]} evicted"
+            for group in groups[:8]
+        ] or ['None']
+        per_command = sorted(metrics.requests_per_command().items(), key=lambda c: -c[1])
+        command_lines = [f"`{command}` {count:.1f}" for command, count in per_command[:8]] or ['None']
+
+        lines = [
+            "**Busiest Endpoints**", *endpoint_lines(metrics.busiest()),
+            "**Slowest Endpoints**", *endpoint_lines(metrics.slowest()),
+            f"**Cache** ({len(cache)}/{cache.maxsize} entries)", *cache_lines,
+            "**Requests Per Command**", *command_lines,
+        ]
+        await ctx.info("ESI Metrics", '\n'.join(lines))
+
+    @commands.command(name="dbstats")
+    @checks.is_co_owner()
+    async def db_stats(self, ctx):
+        """Show database queue depth and wait times"""
+        queues = db.stats()
+        if queues is None:
+            return await ctx.error("Database isn't open")
+        lines = [
+            f"**{kind.title()}** {stats.calls} calls, {stats.pending} queued (peak {stats.peak}), "
+            f"{stats.mean_wait * 1000:.1f}ms avg wait, {stats.wait_max * 1000:.1f}ms max wait, "
+            f"{stats.mean_run * 1000:.1f}ms avg run"
+            for kind, stats in queues.items()
+        ]
+        write_behind = db.write_behind_stats()
+        lines.append(
+            f"**Queued Writes** {write_behind.rows} in {write_behind.flushes} commits, "
+            f"{len(write_behind.pending)} waiting, {write_behind.failed} dropped"
+        )
+        retention = self.bot.retention
+        if retention is not None:
+            deleted = ', '.join(f"{table} {count}" for table, count in retention.deleted.items())
+            lines.append(f"**Pruned Rows** {deleted}")
+        await ctx.info("Database", '\n'.join(lines))
+
+    @commands.command(name="dbqueries")
+    @checks.is_co_owner()
+    async def db_queries(self, ctx, sort: str = 'total'):
+        """Show the statements taking the most database time
+
+        Sort by `total`, `mean`, `wait`, `rows`, `calls` or `slow`.
+        """
+        keys = {
+            'total': lambda s: s.run_sum,
+            'mean': lambda s: s.mean_run,
+            'wait': lambda s: s.wait_sum,
+            'rows': lambda s: s.rows,
+            'calls': lambda s: s.calls,
+            'slow': lambda s: s.slow,
+        }
+        if sort not in keys:
+            return await ctx.error(f"Sort by one of {', '.join(keys)}")
+        statements = sorted(db.statement_stats().items(), key=lambda s: keys[sort](s[1]), reverse=True)
+        lines = []
+        for sql, stats in statements[:8]:
+            callers = ', '.join(caller for caller, _ in stats.callers.most_common(2))
+            lines.append(
+                f"`{textwrap.shorten(sql, 80)}`\n{stats.calls} calls from {callers}, "
+                f"{stats.mean_run * 1000:.1f}ms avg run ({stats.run_max * 1000:.0f}ms max), "
+                f"{stats.mean_wait * 1000:.1f}ms avg wait, {stats.rows} rows, {stats.slow} slow"
+            )
+        await ctx.info(f"Database Statements By {sort.title()}", '\n'.join(lines) or 'None')
+
     # Other commands remain unchanged
 
 
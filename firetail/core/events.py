@@ -7,6 +7,7 @@ import aiohttp
 from discord.ext import commands
 
 from firetail.core.context import Context
+from firetail.lib.metrics import current_command
 
 INTRO = (
     "=========================================",
@@ -34,8 +35,8 @@ async def update_discordbots(bot):
         url = f"https://discordbots.org/api/bots/{bot.user.id}/stats"
         headers = {"Authorization": db_token}
         payload = {"server_count": len(bot.guilds)}
-        async with bot.session as r:
-            r.post(url, data=payload, headers=headers)
+        async with bot.session.post(url, data=payload, headers=headers):
+            pass
 
 
 def init_events(bot, launcher=None):
@@ -116,6 +117,10 @@ def init_events(bot, launcher=None):
             return
 
         ctx = await bot.get_context(message, cls=Context)
+        if ctx.command and bot.esi_data:
+            # attributes the command's ESI requests to it in the metrics
+            current_command.set(ctx.command.qualified_name)
+            bot.esi_data.metrics.record_command(ctx.command.qualified_name)
         await bot.invoke(ctx)
 
     @bot.event
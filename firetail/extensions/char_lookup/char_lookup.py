@@ -1,13 +1,12 @@
-import json
 import logging
 import urllib
 from typing import Union
 
-import aiohttp
 import discord
 from discord.ext import commands
 
 from firetail.core import checks
+from firetail.lib import codec
 from firetail.utils import make_embed
 
 
@@ -165,40 +164,37 @@ class CharLookup(commands.Cog):
                     await ctx.message.delete()
 
     async def zkill_last_mail(self, character_id):
-        async with aiohttp.ClientSession() as session:
-            url = f'https://zkillboard.com/api/no-items/characterID/{character_id}/'
-            async with session.get(url) as resp:
-                data = await resp.text()
-                data = json.loads(data)
-                try:
-                    kill_esi_url = (
-                        f"https://esi.evetech.net/latest/killmails/{data[0]['killmail_id']}/{data[0]['zkb']['hash']}/"
-                    )
-                except Exception:
-                    return None, None
-                async with session.get(kill_esi_url) as kill_resp:
-                    data = await kill_resp.text()
-                    data = json.loads(data)
-                    try:
-                        victim_id = data['victim']['character_id']
-                    except Exception:
-                        victim_id = 0
-                    try:
-                        if victim_id == character_id:
-                            return data['victim'], data['solar_system_id']
-                        else:
-                            for attacker in data['attackers']:
-                                if attacker['character_id'] == character_id:
-                                    return attacker, data['solar_system_id']
-                    except Exception:
-                        return None, None
+        url = f'{self.bot.esi_data.zkill_url}/no-items/characterID/{character_id}/'
+        async with self.bot.transport.zkill.get(url) as resp:
+            data = codec.loads(await resp.read())
+        try:
+            kill_esi_url = (
+                f"{self.bot.esi_data.esi_url}/killmails/{data[0]['killmail_id']}/{data[0]['zkb']['hash']}/"
+            )
+        except Exception:
+            return None, None
+        async with self.bot.transport.esi.get(kill_esi_url) as kill_resp:
+            data = codec.loads(await kill_resp.read())
+        try:
+            victim_id = data['victim']['character_id']
+        except Exception:
+            victim_id = 0
+        try:
+            if victim_id == character_id:
+                return data['victim'], data['solar_system_id']
+            else:
+                for attacker in data['attackers']:
+                    if attacker['character_id'] == character_id:
+                        return attacker, data['solar_system_id']
+        except Exception:
+            return None, None
 
     async def zkill_stats(self, character_id):
-        url = f'https://zkillboard.com/api/stats/characterID/{character_id}/'
-        async with self.bot.session.get(url) as resp:
+        url = f'{self.bot.esi_data.zkill_url}/stats/characterID/{character_id}/'
+        async with self.bot.transport.zkill.get(url) as resp:
             try:
-                data = await resp.json(content_type=None)
-            except json.JSONDecodeError:
+                data = codec.loads(await resp.read())
+            except codec.DecodeError:
                 return None
         if 'allTimeSum' in data:
             return data
@@ -232,8 +228,8 @@ class CharLookup(commands.Cog):
         titans = [11567, 3764, 671, 23773, 42126, 42241, 45649]
         supers = [23919, 23917, 23913, 22852, 3514, 42125]
         probe_launchers = [4258, 4260, 17901, 17938, 28756, 28758]
-        loss_url = f'https://zkillboard.com/api/kills/characterID/{character_id}/losses/no-attackers/'
-        kill_url = f'https://zkillboard.com/api/kills/characterID/{character_id}/kills/no-items/'
+        loss_url = f'{self.bot.esi_data.zkill_url}/kills/characterID/{character_id}/losses/no-attackers/'
+        kill_url = f'{self.bot.esi_data.zkill_url}/kills/characterID/{character_id}/kills/no-items/'
         covert_cyno = 0
         cyno = 0
         probes = 0
@@ -251,83 +247,80 @@ class CharLookup(commands.Cog):
                         special = ' '
         except Exception:
             special = ' '
-        async with aiohttp.ClientSession() as session:
-            async with session.get(loss_url) as resp:
-                losses = await resp.text()
-                losses = json.loads(losses)
-                i = 0
-                for loss in losses:
-                    i = i + 1
-                    if i >= 50:
-                        break
-                    loss_esi_url = (
-                        f"https://esi.evetech.net/latest/killmails/{loss['killmail_id']}/{loss['zkb']['hash']}/"
-                    )
-                    async with session.get(loss_esi_url) as data:
-                        loss_data = await data.text()
-                        loss_data = json.loads(loss_data)
-                        for item in loss_data['victim']['items']:
-                            if item['item_type_id'] == 28646:
-                                covert_cyno = covert_cyno + 1
-                            elif item['item_type_id'] == 21096:
-                                cyno = cyno + 1
-                            elif item['item_type_id'] in probe_launchers:
-                                probes = probes + 1
-                        lost_ship_type_id = loss_data['victim']['ship_type_id']
-                if covert_cyno >= 2:
-                    if 'attackers' not in last_kill:
-                        return '**BLOPS Hotdropper**', special
-                    alliance_ids = []
-                    corporation_ids = []
-                    for attacker in last_kill['attackers']:
-                        if 'alliance_id' in attacker:
-                            alliance_ids.append(attacker['alliance_id'])
-                        if 'corporation_id' in attacker:
-                            corporation_ids.append(attacker['corporation_id'])
-                    try:
-                        dominant_alliance = max(set(alliance_ids), key=alliance_ids.count)
-                        alliance_raw = await self.bot.esi_data.alliance_info(dominant_alliance)
-                        alliance = alliance_raw['name']
-                        return f'**BLOPS Hotdropper for {alliance}**', special
-                    except Exception:
-                        dominant_corp = max(set(corporation_ids), key=corporation_ids.count)
-                        corp_raw = await self.bot.esi_data.corporation_info(dominant_corp)
-                        corp = corp_raw['name']
-                        return f'**BLOPS Hotdropper for {corp}**', special
-                if cyno >= 5 and (threat <= 30 or threat == 0):
-                    return 'Cyno Alt', special
-                if probes >= 5 and threat >= 51:
-                    return '**Combat Prober / Possible FC**', special
-                if probes >= 5 and (threat <= 50 or threat == 0):
-                    return 'Exploration Pilot', special
-                if cyno >= 5 and threat >= 31:
-                    return '**Possible Hot Dropper**', special
-                if threat <= 30 and lost_ship_type_id == 28352:
-                    return 'Rorqual Pilot', special
-                if threat <= 30:
-                    return 'PVE Pilot', special
-                if solo >= 50:
-                    return 'Solo PVP Pilot', special
-                if solo <= 15:
-                    return 'Fleet Pilot', special
-                if solo <= 49:
-                    return 'Balanced PVP Pilot', special
+        async with self.bot.transport.zkill.get(loss_url) as resp:
+            losses = codec.loads(await resp.read())
+        i = 0
+        for loss in losses:
+            i = i + 1
+            if i >= 50:
+                break
+            loss_esi_url = (
+                f"{self.bot.esi_data.esi_url}/killmails/{loss['killmail_id']}/{loss['zkb']['hash']}/"
+            )
+            async with self.bot.transport.esi.get(loss_esi_url) as data:
+                loss_data = codec.loads(await data.read())
+            for item in loss_data['victim']['items']:
+                if item['item_type_id'] == 28646:
+                    covert_cyno = covert_cyno + 1
+                elif item['item_type_id'] == 21096:
+                    cyno = cyno + 1
+                elif item['item_type_id'] in probe_launchers:
+                    probes = probes + 1
+            lost_ship_type_id = loss_data['victim']['ship_type_id']
+        if covert_cyno >= 2:
+            if 'attackers' not in last_kill:
+                return '**BLOPS Hotdropper**', special
+            alliance_ids = []
+            corporation_ids = []
+            for attacker in last_kill['attackers']:
+                if 'alliance_id' in attacker:
+                    alliance_ids.append(attacker['alliance_id'])
+                if 'corporation_id' in attacker:
+                    corporation_ids.append(attacker['corporation_id'])
+            try:
+                dominant_alliance = max(set(alliance_ids), key=alliance_ids.count)
+                alliance_raw = await self.bot.esi_data.alliance_info(dominant_alliance)
+                alliance = alliance_raw['name']
+                return f'**BLOPS Hotdropper for {alliance}**', special
+            except Exception:
+                dominant_corp = max(set(corporation_ids), key=corporation_ids.count)
+                corp_raw = await self.bot.esi_data.corporation_info(dominant_corp)
+                corp = corp_raw['name']
+                return f'**BLOPS Hotdropper for {corp}**', special
+        if cyno >= 5 and (threat <= 30 or threat == 0):
+            return 'Cyno Alt', special
+        if probes >= 5 and threat >= 51:
+            return '**Combat Prober / Possible FC**', special
+        if probes >= 5 and (threat <= 50 or threat == 0):
+            return 'Exploration Pilot', special
+        if cyno >= 5 and threat >= 31:
+            return '**Possible Hot Dropper**', special
+        if threat <= 30 and lost_ship_type_id == 28352:
+            return 'Rorqual Pilot', special
+        if threat <= 30:
+            return 'PVE Pilot', special
+        if solo >= 50:
+            return 'Solo PVP Pilot', special
+        if solo <= 15:
+            return 'Fleet Pilot', special
+        if solo <= 49:
+            return 'Balanced PVP Pilot', special
 
     async def last_kill(self, kill_url):
-        async with self.bot.session.get(kill_url) as resp:
+        async with self.bot.transport.zkill.get(kill_url) as resp:
             try:
-                data = await resp.json(content_type=None)
-            except json.JSONDecodeError:
+                data = codec.loads(await resp.read())
+            except codec.DecodeError:
                 return None
 
         kill_esi_url = (
-            f"https://esi.evetech.net/latest/killmails/{data[0]['killmail_id']}/{data[0]['zkb']['hash']}/"
+            f"{self.bot.esi_data.esi_url}/killmails/{data[0]['killmail_id']}/{data[0]['zkb']['hash']}/"
         )
 
-        async with self.bot.session.get(kill_esi_url) as resp:
+        async with self.bot.transport.esi.get(kill_esi_url) as resp:
             try:
-                data = await resp.json(content_type=None)
-            except json.JSONDecodeError:
+                data = codec.loads(await resp.read())
+            except codec.DecodeError:
                 log.exception(f"Zkillboard killmail failed to parse correctly:\n{data}")
                 return None
             return data[0]
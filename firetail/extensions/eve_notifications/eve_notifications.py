@@ -1,9 +1,8 @@
-from firetail.lib import db
+from firetail.lib import codec, db
 from firetail.utils import make_embed
 import time
 import datetime
 import asyncio
-import json
 
 
 class Notifications:
@@ -81,9 +80,9 @@ class Notifications:
         full_url = "{}{}/{}/Operations/{}".format(base_url, config.fleetUp['user_id'], config.fleetUp['api_code'],
                                                   config.fleetUp['group_id'])
         async with self.bot.session.get(full_url) as resp:
-            data = await resp.text()
+            data = await resp.read()
         try:
-            data = json.loads(data)
+            data = codec.loads(data)
             if data['Success']:
                 return data['Data']
         except Exception:
@@ -21,13 +21,10 @@ class EveRpg:
         """Sets a channel as an RPG channel.
         Do **!setRpg** to have a channel relay all RPG events.
         The RPG includes players from all servers this instance of the bot is on."""
-        sql = ''' REPLACE INTO eve_rpg_channels(server_id,channel_id,owner_id)
-                  VALUES(?,?,?) '''
         author = ctx.message.author.id
         channel = ctx.message.channel.id
         server = ctx.message.guild.id
-        values = (server, channel, author)
-        await db.execute_sql(sql, values)
+        await self.bot.settings.set_rpg_channel(server, channel, author)
         self.logger.info('eve_rpg - {} added {} to the rpg channel list.')
         return await ctx.author.send('**Success** - Channel added.')
 
@@ -35,9 +32,7 @@ class EveRpg:
     @checks.is_mod()
     async def _delete_rpg(self, ctx):
         """Un-sets a channel as an RPG channel."""
-        sql = ''' DELETE FROM eve_rpg_channels WHERE `channel_id` = (?) '''
-        values = (ctx.message.channel.id,)
-        await db.execute_sql(sql, values)
+        await self.bot.settings.remove_rpg_channel(ctx.message.channel.id)
         self.logger.info('eve_rpg - {} removed {} from the rpg channel list.')
         return await ctx.author.send('**Success** - Channel removed.')
 
@@ -167,7 +162,7 @@ class EveRpg:
                     WHERE
                         player_id = (?); '''
             values = ('Ibis', player[0][2],)
-            await db.execute_sql(sql, values)
+            db.queue_write(sql, values)
             ship = 'Ibis'
         ship_two = player_two[0][7]
         if ship_two is None:
@@ -176,7 +171,7 @@ class EveRpg:
                     WHERE
                         player_id = (?); '''
             values = ('Ibis', player_two[0][2],)
-            await db.execute_sql(sql, values)
+            db.queue_write(sql, values)
         #  Share turn
         #  PVP?
         pvp = await self.weighted_choice([(True, 13), (False, 45)])
@@ -199,7 +194,7 @@ class EveRpg:
                         WHERE
                             player_id = (?); '''
                 values = ('Ibis', player[0][2],)
-                await db.execute_sql(sql, values)
+                db.queue_write(sql, values)
                 await self.add_loss(player)
                 return await self.send_turn(message)
             elif flee is True:
@@ -246,7 +241,7 @@ class EveRpg:
                                 WHERE
                                     player_id = (?); '''
                         values = ('Ibis', player[0][2],)
-                        await db.execute_sql(sql, values)
+                        db.queue_write(sql, values)
                         await self.add_loss(player)
                         return await self.send_turn(message)
                     elif flee is True:
@@ -377,7 +372,7 @@ class EveRpg:
                         WHERE
                             player_id = (?); '''
                 values = ('Ibis', loser[0][2],)
-                await db.execute_sql(sql, values)
+                db.queue_write(sql, values)
                 await self.add_loss(loser)
                 await self.add_kill(winner)
             else:
@@ -423,13 +418,12 @@ class EveRpg:
                 await self.send_turn(message)
 
     async def send_turn(self, message):
-        sql = "SELECT * FROM eve_rpg_channels"
-        game_channels = await db.select(sql)
-        for channels in game_channels:
-            channel = self.bot.get_channel(int(channels[2]))
+        for channel_id in list(self.bot.settings.rpg_channels.values()):
+            channel = self.bot.get_channel(channel_id)
             if channel is None:
                 self.logger.exception('eve_rpg - Bad Channel Attempted removing....')
-                await self.remove_bad_channel(channels[2])
+                await self.remove_bad_channel(channel_id)
+                continue
             await channel.send(message)
 
     async def remove_bad_user(self, player_id):
@@ -439,9 +433,7 @@ class EveRpg:
         return self.logger.info('eve_rpg - Bad player removed successfully')
 
     async def remove_bad_channel(self, channel_id):
-        sql = ''' DELETE FROM eve_rpg_channels WHERE `channel_id` = (?) '''
-        values = (channel_id,)
-        await db.execute_sql(sql, values)
+        await self.bot.settings.remove_rpg_channel(channel_id)
         return self.logger.info('eve_rpg - Bad Channel removed successfully')
 
     async def add_xp(self, player, xp_gained):
@@ -458,7 +450,7 @@ class EveRpg:
                     WHERE
                         player_id = (?); '''
             values = (player[0][5] + 1, 0, player[0][2],)
-        await db.execute_sql(sql, values)
+        db.queue_write(sql, values)
 
     async def add_kill(self, player):
         sql = ''' UPDATE eve_rpg_players
@@ -466,7 +458,7 @@ class EveRpg:
                 WHERE
                     player_id = (?); '''
         values = (int(player[0][3]) + 1, player[0][2],)
-        await db.execute_sql(sql, values)
+        db.queue_write(sql, values)
 
     async def add_loss(self, player):
         sql = ''' UPDATE eve_rpg_players
@@ -474,7 +466,7 @@ class EveRpg:
                 WHERE
                     player_id = (?); '''
         values = (int(player[0][4]) + 1, player[0][2],)
-        await db.execute_sql(sql, values)
+        db.queue_write(sql, values)
 
     async def new_item(self, player, escalation=False):
         items = player[0][8]
@@ -497,7 +489,7 @@ class EveRpg:
                 values = ('{}, {}'.format(items, item), player[0][2],)
             else:
                 values = ('{}'.format(item), player[0][2],)
-            await db.execute_sql(sql, values)
+            db.queue_write(sql, values)
             return item
 
     async def new_ship(self, player):
@@ -543,7 +535,7 @@ class EveRpg:
                     WHERE
                         player_id = (?); '''
             values = (ship, player[0][2],)
-            await db.execute_sql(sql, values)
+            db.queue_write(sql, values)
             return ship
         else:
             return None
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import re
 from datetime import datetime
 
@@ -7,7 +6,7 @@ import pytz
 from discord.ext import commands
 
 from firetail.core import checks
-from firetail.lib import db
+from firetail.lib import codec, db
 from firetail.utils import make_embed
 
 
@@ -138,9 +137,9 @@ class FleetUp(commands.Cog):
         full_url = f"{base_url}{config.fleetUp['user_id']}/{config.fleetUp['api_code']}/" \
                    f"Operations/{config.fleetUp['group_id']}"
         async with self.bot.session.get(full_url) as resp:
-            data = await resp.text()
+            data = await resp.read()
         try:
-            data = json.loads(data)
+            data = codec.loads(data)
             if data['Success']:
                 return data['Data']
         except Exception:
@@ -1,12 +1,11 @@
-import json
 import logging
 import re
 from urllib import parse
 
-import aiohttp
 from discord.ext import commands
 
 from firetail.core import checks
+from firetail.lib import codec
 
 log = logging.getLogger(__name__)
 
@@ -14,6 +13,9 @@ log = logging.getLogger(__name__)
 class GroupLookup(commands.Cog):
     """This extension handles looking up corps and alliance."""
 
+    def __init__(self, bot):
+        self.bot = bot
+
     @commands.command(aliases=["corp", "alliance"])
     @checks.spam_check()
     @checks.is_whitelist()
@@ -210,11 +212,9 @@ class GroupLookup(commands.Cog):
             await ctx.message.delete()
 
     async def zkill_stats(self, group_id, group_type):
-        async with aiohttp.ClientSession() as session:
-            url = f'https://zkillboard.com/api/stats/{group_type}/{group_id}/'
-            async with session.get(url) as resp:
-                data = await resp.text()
-                data = json.loads(data)
-                if 'allTimeSum' in data:
-                    return data
-                return None
+        url = f'{self.bot.esi_data.zkill_url}/stats/{group_type}/{group_id}/'
+        async with self.bot.transport.zkill.get(url) as resp:
+            data = codec.loads(await resp.read())
+        if 'allTimeSum' in data:
+            return data
+        return None
@@ -1,5 +1,3 @@
-import asyncio
-import json
 import logging
 import websockets
 from typing import Optional
@@ -8,8 +6,10 @@ import discord
 from discord.ext import commands
 
 from firetail.core import checks
-from firetail.lib import db
+from firetail.lib import codec, db
+from firetail.lib.esi import ZKILL_WS_URL
 from firetail.utils.formatters import convert_to_bool
+from .matcher import SubscriptionIndex
 from .objects import Mail, Subscription
 
 log = logging.getLogger(__name__)
@@ -18,7 +18,7 @@ log = logging.getLogger(__name__)
 class Killmail(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.subs = {}
+        self.subs = SubscriptionIndex()
         self.ws_task = None
         self.km_counter = 0
         self.prepare = self.bot.loop.create_task(self.prepare_subs())
@@ -49,7 +49,7 @@ class Killmail(commands.Cog):
         )
         id_ = await db.execute_sql(sql, (channel_id, server_id, group_id, owner_id, losses, threshold or 1))
         sub = Subscription(id_, self.bot.get_channel(channel_id), threshold, convert_to_bool(losses), group_id)
-        self.subs[sub.id] = sub
+        self.subs.add(sub)
 
     async def prepare_subs(self):
         await self.bot.wait_until_ready()
@@ -63,7 +63,7 @@ class Killmail(commands.Cog):
                 await self.remove_bad_channel(channel_id)
 
             sub = Subscription(id_, channel, threshold, convert_to_bool(losses), group_id)
-            self.subs[sub.id] = sub
+            self.subs.add(sub)
 
         self.ws_task = self.bot.loop.create_task(self.listen_for_mails())
 
@@ -72,11 +72,15 @@ class Killmail(commands.Cog):
         mail = Mail(killmail_data['killmail'], self.bot.esi_data)
         if mail.npc:
             return
-        asyncio.gather(*[sub.mail(mail) for sub in self.subs.values()])
+        self.bot.loop.create_task(self.send_mail(mail))
+
+    async def send_mail(self, mail):
+        for sub, is_loss in await self.subs.match(mail):
+            self.bot.loop.create_task(mail.send_embed(sub.channel, is_loss))
 
     async def listen_for_mails(self):
         """Connect to the zKillboard WebSocket and listen for killmails."""
-        ws_url = "wss://zkillboard.com:2096/"
+        ws_url = getattr(self.bot.config, 'zkill_ws_url', ZKILL_WS_URL)
         subscription = {
             "action": "sub",
             "channel": f"firetail_{self.bot.user.id}",
@@ -84,13 +88,13 @@ class Killmail(commands.Cog):
 
         async with websockets.connect(ws_url) as websocket:
             # Send subscription message
-            await websocket.send(json.dumps(subscription))
+            await websocket.send(codec.dumps(subscription))
             log.info("Subscribed to zKillboard WebSocket.")
 
             while True:
                 # Receive messages from the WebSocket
                 message = await websocket.recv()
-                data = json.loads(message)
+                data = codec.loads(message)
 
                 # Check if the received data has a package
                 if "package" in data and data["package"]:
@@ -178,19 +182,16 @@ class Killmail(commands.Cog):
 
             sql = "DELETE FROM add_kills WHERE id = (?)"
             await db.execute_sql(sql, (sub_id,))
-            del self.subs[sub_id]
+            self.subs.remove(sub_id)
             await ctx.success(f'Killmail {sub_id} has been removed.')
             return
 
         sql = "DELETE FROM add_kills WHERE channelid = ?"
         await db.execute_sql(sql, (ctx.channel.id,))
 
-        rm_ids = []
-        for sub in self.subs.values():
+        for sub in self.subs:
             if sub.channel.id == ctx.channel.id:
-                rm_ids.append(sub.id)
-        for rm_id in rm_ids:
-            del self.subs[rm_id]
+                self.subs.remove(sub.id)
 
         await ctx.success(
             "All killmail subs removed for this channel.",
@@ -0,0 +1,106 @@
+import logging
+from bisect import bisect_right
+
+log = logging.getLogger(__name__)
+
+# region IDs, told apart from the other group IDs so a mail's region is only
+# looked up while there are region subscriptions
+REGION_IDS = range(10000000, 13000000)
+
+
+class SubscriptionIndex:
+    """Killmail subscriptions indexed for matching each mail in time
+    proportional to the subscriptions it matches.
+
+    Subscriptions with a group are held by their group ID, which may be a
+    corp, alliance, system or region ID, so a mail only looks up its own
+    IDs. Global subscriptions are held sorted by threshold, so those a
+    mail's value reaches are a prefix of the list.
+    """
+
+    def __init__(self):
+        self._by_id = {}
+        self._by_group = {}
+        self._thresholds = []
+        self._global = []
+        self._regions = 0
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def get(self, sub_id):
+        return self._by_id.get(sub_id)
+
+    def add(self, sub):
+        self.remove(sub.id)
+        self._by_id[sub.id] = sub
+        if sub.group_id:
+            self._by_group.setdefault(sub.group_id, []).append(sub)
+            if sub.group_id in REGION_IDS:
+                self._regions += 1
+        else:
+            threshold = sub.threshold or 0
+            i = bisect_right(self._thresholds, threshold)
+            self._thresholds.insert(i, threshold)
+            self._global.insert(i, sub)
+
+    def remove(self, sub_id):
+        sub = self._by_id.pop(sub_id, None)
+        if sub is None:
+            return None
+        if sub.group_id:
+            subs = self._by_group[sub.group_id]
+            subs.remove(sub)
+            if not subs:
+                del self._by_group[sub.group_id]
+            if sub.group_id in REGION_IDS:
+                self._regions -= 1
+        else:
+            i = next(i for i, global_sub in enumerate(self._global) if global_sub is sub)
+            del self._thresholds[i]
+            del self._global[i]
+        return sub
+
+    async def match(self, mail):
+        """Returns a list of ``(subscription, is_loss)`` for each
+        subscription ``mail`` should be posted to."""
+        value = mail.value or 0
+        matched = {}
+
+        def check(subs, losses_only=False):
+            for sub in subs:
+                if sub.id in matched or (losses_only and not sub.losses):
+                    continue
+                if sub.threshold and value < sub.threshold:
+                    continue
+                matched[sub.id] = sub
+
+        for sub in self._global[:bisect_right(self._thresholds, value)]:
+            matched[sub.id] = sub
+
+        by_group = self._by_group
+        if by_group:
+            victim_groups = {mail.corp_id, mail.alliance_id}
+            attacker_groups = set()
+            for attacker in mail.attackers.values():
+                attacker_groups.add(attacker.corp_id)
+                attacker_groups.add(attacker.alliance_id)
+            for group_id in attacker_groups | {mail.system_id}:
+                if group_id in by_group:
+                    check(by_group[group_id])
+            for group_id in victim_groups - attacker_groups:
+                if group_id in by_group:
+                    check(by_group[group_id], losses_only=True)
+            if self._regions:
+                if not mail.region_id:
+                    try:
+                        await mail.fetch_constellation()
+                    except Exception:
+                        log.exception(f'Killmail - Region lookup failed for {mail!r}')
+                if mail.region_id in by_group:
+                    check(by_group[mail.region_id])
+
+        return [(sub, sub.is_loss(mail)) for sub in matched.values()]
@@ -29,8 +29,7 @@ class Item:
         self.name = None
 
     async def fetch_name(self):
-        item = await self._esi.item_info(self.item_type_id)
-        self.name = item.get('name')
+        self.name = await self._esi.names.name(self.item_type_id)
 
 
 class Character:
@@ -54,28 +53,27 @@ class Character:
 
     async def fetch_corp(self):
         if not self.corp:
-            corp = await self._esi.corporation_info(self.corp_id)
-            self.corp = corp.get('name')
+            self.corp = await self._esi.names.name(self.corp_id)
 
     async def fetch_alliance(self):
         if not self.alliance and self.alliance_id:
-            alliance = await self._esi.alliance_info(self.alliance_id)
-            self.alliance = alliance.get('name')
+            self.alliance = await self._esi.names.name(self.alliance_id)
 
     async def fetch_ship(self):
         if not self.ship_type_id:
             return
         if not self.ship:
-            ship = await self._esi.item_info(self.ship_type_id)
-            self.ship = ship.get('name')
-
-    def fetch_all(self):
-        return asyncio.gather(
-            self.fetch_name(),
-            self.fetch_corp(),
-            self.fetch_alliance(),
-            self.fetch_ship()
-        )
+            self.ship = await self._esi.names.name(self.ship_type_id)
+
+    async def fetch_all(self):
+        """Fetches all names in one batched lookup."""
+        names = await self._esi.names.names([self.id, self.corp_id, self.alliance_id, self.ship_type_id])
+        self.name = self.name or names.get(self.id)
+        self.corp = self.corp or names.get(self.corp_id)
+        if self.alliance_id:
+            self.alliance = self.alliance or names.get(self.alliance_id)
+        if self.ship_type_id:
+            self.ship = self.ship or names.get(self.ship_type_id)
 
     def info_output(self):
         info = []
@@ -195,7 +193,7 @@ class Mail:
 
     async def fetch_celestial(self):
         if not self.celestial:
-            celestial = await self._esi.celestial_info(self.location_id)
+            celestial = await self._esi.celestial_info(self.location_id, system_id=self.system_id)
             self.celestial = celestial.get('name', 'Unknown')
 
     def fetch_all(self):
@@ -255,14 +253,13 @@ class Subscription:
         grp = f"group_id={self.group_id}" if self.group_id else ""
         return f"<Subscription {id_} channel={chan} threshold={th}{loss}{grp}>"
 
+    def is_loss(self, killmail: Mail):
+        return bool(self.group_id) and self.group_id in [killmail.corp_id, killmail.alliance_id]
+
     async def mail(self, killmail: Mail):
         if await self.valid(killmail):
             loop = asyncio.get_event_loop()
-            if self.group_id:
-                is_loss = self.group_id in [killmail.corp_id, killmail.alliance_id]
-            else:
-                is_loss = False
-            loop.create_task(killmail.send_embed(self.channel, is_loss))
+            loop.create_task(killmail.send_embed(self.channel, self.is_loss(killmail)))
 
     async def valid(self, killmail: Mail):
         if self.threshold and killmail.value < self.threshold:
@@ -284,7 +281,7 @@ class Subscription:
             return True
 
         if not killmail.region_id:
-            await killmail.fetch_celestial()
+            await killmail.fetch_constellation()
         if self.group_id == killmail.region_id:
             return True
 
@@ -4,6 +4,7 @@ import operator
 from discord.ext import commands
 
 from firetail.core import checks
+from firetail.lib import codec
 from firetail.utils import make_embed
 
 log = logging.getLogger(__name__)
@@ -84,25 +85,24 @@ class LocationScout(commands.Cog):
                 stargate_count = len(data['stargates'])
             else:
                 stargate_count = 'N/A'
-            ship_kills, npc_kills, pod_kills = await self.get_kill_info(data['system_id'])
-            sov_battles = await self.bot.esi_data.get_active_sov_battles()
+            ship_kills, npc_kills, pod_kills = await self.bot.esi_data.get_kill_info(data['system_id'])
+            sov_battles = await self.bot.esi_data.get_active_sov_battles(data['system_id'])
             active_sov = False
             if security_status < 0.1:
                 sov_corp, sov_alliance, sov_alliance_id = await self.get_sov_info(data['system_id'])
                 for fights in sov_battles:
-                    if fights['solar_system_id'] == data['system_id']:
-                        if 'defender_score' in fights:
-                            active_sov = True
-                            target_system_id = fights['solar_system_id']
-                            target_system_info = await self.bot.esi_data.system_info(target_system_id)
-                            target_system_name = target_system_info['name']
-                            fight_type_raw = fights['event_type']
-                            fight_type = fight_type_raw.replace('_', ' ').title()
-                            defender_id = fights['defender_id']
-                            defender_name = await self.group_name(defender_id)
-                            defender_score = fights['defender_score']
-                            attacker_score = fights['attackers_score']
-                            break
+                    if 'defender_score' in fights:
+                        active_sov = True
+                        target_system_id = fights['solar_system_id']
+                        target_system_info = await self.bot.esi_data.system_info(target_system_id)
+                        target_system_name = target_system_info['name']
+                        fight_type_raw = fights['event_type']
+                        fight_type = fight_type_raw.replace('_', ' ').title()
+                        defender_id = fights['defender_id']
+                        defender_name = await self.group_name(defender_id)
+                        defender_score = fights['defender_score']
+                        attacker_score = fights['attackers_score']
+                        break
             ship_jumps = await self.bot.esi_data.get_jump_info(data['system_id'])
             logo_link = f'https://imageserver.eveonline.com/Alliance/{sov_alliance_id}_64.png'
             zkill_link = f"https://zkillboard.com/system/{data['system_id']}"
@@ -198,13 +198,13 @@ class LocationScout(commands.Cog):
             systems = data['systems']
             systems_count = len(data['systems'])
             system_kills = []
+            system_names = await self.bot.esi_data.names.names(systems)
             for system in systems:
-                ship_kills, npc_kills, pod_kills = await self.get_kill_info(system)
+                ship_kills, npc_kills, pod_kills = await self.bot.esi_data.get_kill_info(system)
                 ship_jumps = await self.bot.esi_data.get_jump_info(system)
-                system_name = await self.bot.esi_data.system_name(system)
                 system_kills.append(
                     {
-                        "system": system_name,
+                        "system": system_names.get(system),
                         "npc_kills": npc_kills,
                         "ship_kills": ship_kills,
                         "ship_jumps": ship_jumps
@@ -271,7 +271,7 @@ class LocationScout(commands.Cog):
                 constellation_data = await self.bot.esi_data.constellation_info(constellation)
                 systems = constellation_data['systems']
                 for system in systems:
-                    ship_kills, npc_kills, pod_kills = await self.get_kill_info(system)
+                    ship_kills, npc_kills, pod_kills = await self.bot.esi_data.get_kill_info(system)
                     system_kills.append({'system_id': system, "npc_kills": npc_kills, "ship_kills": ship_kills})
             system_count = len(system_kills)
             top_npc_sorted = sorted(system_kills, key=operator.itemgetter("npc_kills"), reverse=True)
@@ -307,9 +307,12 @@ class LocationScout(commands.Cog):
             if active_sov is True:
                 embed.add_field(name="Active Sov Battles", value=f'Count: {sov_battle_count}', inline=False)
 
-            system_0 = await self.bot.esi_data.system_name(top_npc_sorted[0]['system_id'])
-            system_1 = await self.bot.esi_data.system_name(top_npc_sorted[1]['system_id'])
-            system_2 = await self.bot.esi_data.system_name(top_npc_sorted[2]['system_id'])
+            top_ids = [s['system_id'] for s in top_npc_sorted[:3] + top_ship_sorted[:3]]
+            system_names = await self.bot.esi_data.names.names(top_ids)
+
+            system_0 = system_names.get(top_npc_sorted[0]['system_id'])
+            system_1 = system_names.get(top_npc_sorted[1]['system_id'])
+            system_2 = system_names.get(top_npc_sorted[2]['system_id'])
 
             embed.add_field(
                 name="Most NPC's Killed",
@@ -321,9 +324,9 @@ class LocationScout(commands.Cog):
                 inline=False
             )
 
-            system_0 = await self.bot.esi_data.system_name(top_ship_sorted[0]['system_id'])
-            system_1 = await self.bot.esi_data.system_name(top_ship_sorted[1]['system_id'])
-            system_2 = await self.bot.esi_data.system_name(top_ship_sorted[2]['system_id'])
+            system_0 = system_names.get(top_ship_sorted[0]['system_id'])
+            system_1 = system_names.get(top_ship_sorted[1]['system_id'])
+            system_2 = system_names.get(top_ship_sorted[2]['system_id'])
 
             embed.add_field(
                 name="Most Players's Killed",
@@ -339,45 +342,25 @@ class LocationScout(commands.Cog):
             if ctx.bot.config.delete_commands:
                 await ctx.message.delete()
 
-    async def get_kill_info(self, system_id):
-        url = 'https://esi.evetech.net/latest/universe/system_kills/?datasource=tranquility'
-        async with self.bot.session.get(url) as resp:
-            data = await resp.json(content_type=None)
-            ship_kills = 0
-            npc_kills = 0
-            pod_kills = 0
-            for system in data:
-                if system['system_id'] == system_id:
-                    ship_kills = system['ship_kills']
-                    npc_kills = system['npc_kills']
-                    pod_kills = system['pod_kills']
-                    break
-            return ship_kills, npc_kills, pod_kills
-
     async def get_sov_info(self, system_id):
-        url = 'https://esi.evetech.net/latest/sovereignty/map/?datasource=tranquility'
-        async with self.bot.session.get(url) as resp:
-            data = await resp.json(content_type=None)
-            sov_alliance_id = 1
-            sov_corp = 'N/A'
-            sov_alliance = 'N/A'
-            for system in data:
-                if system['system_id'] == system_id:
-                    if 'corporation_id' in system:
-                        sov_corp_id = system['corporation_id']
-                        corporation_info = await self.bot.esi_data.corporation_info(sov_corp_id)
-                        sov_corp = corporation_info['name']
-                    if 'alliance_id' in system:
-                        sov_alliance_id = system['alliance_id']
-                        alliance_info = await self.bot.esi_data.alliance_info(sov_alliance_id)
-                        sov_alliance = alliance_info['name']
-                    break
-            return sov_corp, sov_alliance, sov_alliance_id
+        system = await self.bot.esi_data.get_sov_info(system_id) or {}
+        sov_alliance_id = 1
+        sov_corp = 'N/A'
+        sov_alliance = 'N/A'
+        if 'corporation_id' in system:
+            sov_corp_id = system['corporation_id']
+            corporation_info = await self.bot.esi_data.corporation_info(sov_corp_id)
+            sov_corp = corporation_info['name']
+        if 'alliance_id' in system:
+            sov_alliance_id = system['alliance_id']
+            alliance_info = await self.bot.esi_data.alliance_info(sov_alliance_id)
+            sov_alliance = alliance_info['name']
+        return sov_corp, sov_alliance, sov_alliance_id
 
     async def group_name(self, group_id):
-        url = f'https://esi.evetech.net/latest/alliances/{group_id}/?datasource=tranquility'
-        async with self.bot.session.get(url) as resp:
-            data = await resp.json(content_type=None)
+        url = f'{self.bot.esi_data.esi_url}/alliances/{group_id}/?datasource=tranquility'
+        async with self.bot.transport.esi.get(url) as resp:
+            data = codec.loads(await resp.read())
             try:
                 return data["name"]
             except Exception:
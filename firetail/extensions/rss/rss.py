@@ -2,6 +2,7 @@ from firetail.lib import db
 import asyncio
 import feedparser
 import discord
+import time
 from datetime import datetime
 
 class Rss:
@@ -44,12 +45,12 @@ class Rss:
         self.logger.info('Polling for new RSS feeds')
         feeds = {}
         for feed_name, feed in self.config.rss['feeds'].items():
-            async with self.bot.session.get(feed['uri']) as resp:
+            async with self.bot.transport.rss.get(feed['uri']) as resp:
                 if resp.status != 200:
                     self.logger.error("Failed to get RSS data for feed: {}".format(feed_name))
                     break
-                text = await resp.text()
-                content = feedparser.parse(text)
+                # feedparser works out the encoding from the raw bytes
+                content = feedparser.parse(await resp.read())
                 feeds[feed_name] = content
         return feeds
 
@@ -110,7 +111,8 @@ class Rss:
                 self.logger.exception("Bad channel {} for feed {}".format(
                     channel_id, feed_name))
                 break
-            # Start sending entries
+            # Start sending entries, recording those sent together afterwards
+            sent = []
             for entry in feed['entries']:
                 content, embed = self.format_message(feed['feed']['title'], entry)
                 try:
@@ -120,12 +122,14 @@ class Rss:
                     self.logger.exception("Failed to send {} to channel {} for feed {}".format(
                         entry['id'], channel_id, feed_name))
                 else:
-                    sql = '''REPLACE INTO rss(entry_id,channel_id) VALUES(?,?)'''
-                    values = (entry['id'], channel_id)
-                    try:
-                        await db.execute_sql(sql, values)
-                    except Exception:
-                        self.logger.exception("Failed to store sending of entry {}".format(entry['id']))
+                    sent.append((entry['id'], channel_id, time.time()))
+            if sent:
+                sql = '''REPLACE INTO rss(entry_id,channel_id,posted_at) VALUES(?,?,?)'''
+                try:
+                    await db.execute_many(sql, sent)
+                except Exception:
+                    self.logger.exception("Failed to store sending of {} entries for feed {}".format(
+                        len(sent), feed_name))
 
     async def remove_bad_channel(self, channel_id):
         sql = ''' DELETE FROM rss WHERE `channel_id` = (?) '''
@@ -6,7 +6,7 @@ import pytz
 from discord.ext import commands
 
 from firetail.core import checks
-from firetail.lib import db
+from firetail.lib import codec, db
 from firetail.utils import make_embed
 
 log = logging.getLogger(__name__)
@@ -25,12 +25,12 @@ class SovTracker(commands.Cog):
             try:
                 sql = "SELECT * FROM sov_tracker"
                 sov_tracking = await db.select(sql)
-                sov_battles = await self.bot.esi_data.get_active_sov_battles()
                 for tracked in sov_tracking:
                     active = False
                     tracked_system_id = tracked[3]
                     tracked_fight_type = tracked[2]
                     system_data = await self.bot.esi_data.system_info(tracked_system_id)
+                    sov_battles = await self.bot.esi_data.get_active_sov_battles(tracked_system_id)
                     for fights in sov_battles:
                         fight_system_id = fights['solar_system_id']
                         fight_fight_type = fights['event_type']
@@ -54,11 +54,11 @@ class SovTracker(commands.Cog):
                                     "WHERE system_id = (?) AND fight_type = (?)"
                                 )
                                 values = (defender_score, attacker_score, fight_system_id, fight_fight_type,)
-                                await db.execute_sql(sql, values)
+                                db.queue_write(sql, values)
                     if active is False:
                         sql = "DELETE FROM sov_tracker WHERE system_id = (?) AND fight_type = (?)"
                         values = (tracked_system_id, tracked_fight_type,)
-                        await db.execute_sql(sql, values)
+                        db.queue_write(sql, values)
                         if tracked[4] > tracked[5]:
                             winner = 'Defender'
                         else:
@@ -85,30 +85,29 @@ class SovTracker(commands.Cog):
         if system_data is None:
             dest = ctx.author if ctx.bot.config.dm_only else ctx
             return await dest.send(f'**ERROR:** Could not find a system named {system}')
-        sov_battles = await self.bot.esi_data.get_active_sov_battles()
+        sov_battles = await self.bot.esi_data.get_active_sov_battles(system_data['system_id'])
         for fights in sov_battles:
-            if fights['solar_system_id'] == system_data['system_id']:
-                fight_type_raw = fights['event_type']
-                fight_type = fight_type_raw.replace('_', ' ').title()
-                start_time = datetime.strptime(fights['start_time'], '%Y-%m-%dT%H:%M:%SZ')
-                time = datetime.now(pytz.timezone('UTC')).strftime('%Y-%m-%dT%H:%M:%SZ')
-                current_time = datetime.strptime(time, '%Y-%m-%dT%H:%M:%SZ')
-                defender_id = fights.get('defender_id', 'Freeport')
-                defender_name = await self.group_name(defender_id) if defender_id != 'Freeport' else 'Freeport'
-                if current_time > start_time:
-                    defender_score = fights['defender_score']
-                    attacker_score = fights['attackers_score']
-                    sql = (
-                        "REPLACE INTO sov_tracker(channel_id, fight_type, system_id, defender_score, attackers_score) "
-                        "VALUES(?,?,?,?,?)"
-                    )
-                    values = (ctx.channel.id, fight_type_raw, system_data['system_id'], defender_score, attacker_score)
-                    await db.execute_sql(sql, values)
-                    await self.report_current(
-                        system_data, fight_type, defender_name, defender_score, attacker_score, ctx
-                    )
-                else:
-                    await self.report_upcoming(ctx, system_data, fight_type, defender_name)
+            fight_type_raw = fights['event_type']
+            fight_type = fight_type_raw.replace('_', ' ').title()
+            start_time = datetime.strptime(fights['start_time'], '%Y-%m-%dT%H:%M:%SZ')
+            time = datetime.now(pytz.timezone('UTC')).strftime('%Y-%m-%dT%H:%M:%SZ')
+            current_time = datetime.strptime(time, '%Y-%m-%dT%H:%M:%SZ')
+            defender_id = fights.get('defender_id', 'Freeport')
+            defender_name = await self.group_name(defender_id) if defender_id != 'Freeport' else 'Freeport'
+            if current_time > start_time:
+                defender_score = fights['defender_score']
+                attacker_score = fights['attackers_score']
+                sql = (
+                    "REPLACE INTO sov_tracker(channel_id, fight_type, system_id, defender_score, attackers_score) "
+                    "VALUES(?,?,?,?,?)"
+                )
+                values = (ctx.channel.id, fight_type_raw, system_data['system_id'], defender_score, attacker_score)
+                await db.execute_sql(sql, values)
+                await self.report_current(
+                    system_data, fight_type, defender_name, defender_score, attacker_score, ctx
+                )
+            else:
+                await self.report_upcoming(ctx, system_data, fight_type, defender_name)
 
     @sov.command(name="remove")
     @checks.spam_check()
@@ -256,29 +255,24 @@ class SovTracker(commands.Cog):
             return None
 
     async def get_sov_info(self, system_id):
-        url = 'https://esi.evetech.net/latest/sovereignty/map/?datasource=tranquility'
-        async with self.bot.session.get(url) as resp:
-            data = await resp.json(content_type=None)
-            sov_alliance_id = 1
-            sov_corp = 'N/A'
-            sov_alliance = 'N/A'
-            for system in data:
-                if system['system_id'] == system_id:
-                    if 'corporation_id' in system:
-                        sov_corp_id = system['corporation_id']
-                        corporation_info = await self.bot.esi_data.corporation_info(sov_corp_id)
-                        sov_corp = corporation_info['name']
-                    if 'alliance_id' in system:
-                        sov_alliance_id = system['alliance_id']
-                        alliance_info = await self.bot.esi_data.alliance_info(sov_alliance_id)
-                        sov_alliance = alliance_info['name']
-                    break
-            return sov_corp, sov_alliance, sov_alliance_id
+        system = await self.bot.esi_data.get_sov_info(system_id) or {}
+        sov_alliance_id = 1
+        sov_corp = 'N/A'
+        sov_alliance = 'N/A'
+        if 'corporation_id' in system:
+            sov_corp_id = system['corporation_id']
+            corporation_info = await self.bot.esi_data.corporation_info(sov_corp_id)
+            sov_corp = corporation_info['name']
+        if 'alliance_id' in system:
+            sov_alliance_id = system['alliance_id']
+            alliance_info = await self.bot.esi_data.alliance_info(sov_alliance_id)
+            sov_alliance = alliance_info['name']
+        return sov_corp, sov_alliance, sov_alliance_id
 
     async def group_name(self, group_id):
-        url = f'https://esi.evetech.net/latest/alliances/{group_id}/?datasource=tranquility'
-        async with self.bot.session.get(url) as resp:
-            data = await resp.json(content_type=None)
+        url = f'{self.bot.esi_data.esi_url}/alliances/{group_id}/?datasource=tranquility'
+        async with self.bot.transport.esi.get(url) as resp:
+            data = codec.loads(await resp.read())
             try:
                 return data["name"]
             except Exception:
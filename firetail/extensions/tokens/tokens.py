@@ -27,10 +27,11 @@ class Token:
             character_id = verify['CharacterID']
         except:
             return await ctx.send("ERROR: That is not a valid refresh token.")
-        expires = float(access_token['expires_in']) + time.time()
-        sql = ''' REPLACE INTO access_tokens(character_id,discord_id,refresh_token,access_token,expires)
-                  VALUES(?,?,?,?,?) '''
-        values = (character_id, ctx.author.id, token, access_token['access_token'], expires)
+        now = time.time()
+        expires = float(access_token['expires_in']) + now
+        sql = ''' REPLACE INTO access_tokens(character_id,discord_id,refresh_token,access_token,expires,refreshed_at)
+                  VALUES(?,?,?,?,?,?) '''
+        values = (character_id, ctx.author.id, token, access_token['access_token'], expires, now)
         await db.execute_sql(sql, values)
         self.logger.info('Token - ' + str(ctx.message.author) + ' added a refresh token.')
         if ctx.guild is not None and ctx.channel.permissions_for(ctx.guild.me).manage_messages:
@@ -57,6 +58,7 @@ class Token:
                                       'utf-8'))
         sql = "SELECT * FROM access_tokens"
         tokens = await db.select(sql)
+        refreshed = []
         for token in tokens:
             access_token = await self.bot.esi_data.refresh_access_token(token[3], auth)
             try:
@@ -64,11 +66,13 @@ class Token:
                 character_id = verify['CharacterID']
             except:
                 sql = ''' DELETE FROM access_tokens WHERE refresh_token = ? '''
-                values = (access_token['refresh_token'])
+                values = (token[3],)
                 await db.execute_sql(sql, values)
                 continue
-            expires = float(access_token['expires_in']) + time.time()
-            sql = ''' REPLACE INTO access_tokens(refresh_token,access_token,expires)
-                      VALUES(?,?,?) '''
-            values = (token[3], access_token['access_token'], expires)
-            await db.execute_sql(sql, values)
+            now = time.time()
+            expires = float(access_token['expires_in']) + now
+            refreshed.append((access_token['access_token'], expires, now, token[3]))
+        if refreshed:
+            sql = ''' UPDATE access_tokens SET access_token = ?, expires = ?, refreshed_at = ?
+                      WHERE refresh_token = ? '''
+            await db.execute_many(sql, refreshed)
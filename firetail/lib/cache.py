@@ -0,0 +1,340 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+from . import models
+
+DEFAULT_MAXSIZE = 20000
+DEFAULT_TTL = 300
+PERSISTENT_PATH = 'firetail_cache.sqlite'
+
+log = logging.getLogger(__name__)
+
+
+def cache_ttl(headers, default=DEFAULT_TTL):
+    """Works out how long a response may be cached for from its headers.
+
+    ``Cache-Control: max-age`` takes priority, otherwise the difference
+    between the ``Expires`` and ``Date`` headers is used. If neither are
+    usable, ``default`` is returned.
+
+    Parameters
+    ----------
+    headers: Mapping[str, str]
+        The response headers.
+    default: `float`, optional
+        Fallback TTL in seconds.
+
+    Returns
+    -------
+    float
+        Number of seconds the response is valid for. Never negative.
+    """
+    cache_control = headers.get('Cache-Control', '')
+    for directive in cache_control.split(','):
+        name, _, value = directive.strip().partition('=')
+        if name.lower() == 'max-age':
+            try:
+                return max(float(value), 0)
+            except ValueError:
+                break
+
+    expires = headers.get('Expires')
+    if not expires:
+        return default
+    try:
+        expires = parsedate_to_datetime(expires)
+        date = headers.get('Date')
+        now = parsedate_to_datetime(date).timestamp() if date else time.time()
+    except (TypeError, ValueError):
+        return default
+    return max(expires.timestamp() - now, 0)
+
+
+class TTLCache:
+    """A bounded mapping with per-entry expiry and LRU eviction.
+
+    Entries are stored alongside their expiry time and are treated as
+    missing once expired. When the cache is full, the least recently
+    used entry is evicted to make room.
+
+    Parameters
+    ----------
+    maxsize: `int`, optional
+        Maximum number of entries held before evicting.
+    default_ttl: `float`, optional
+        TTL in seconds used when ``set`` is not given one. ``None``
+        means entries never expire.
+    persistent: `PersistentCache`, optional
+        On-disk tier that entries are written through to, and that
+        :meth:`fetch` looks misses up in before counting them as a miss.
+    group_by: Callable[[Any], str], optional
+        Function naming the group a key belongs to. When given, hits,
+        misses and evictions are also counted per group.
+    persist: Callable[[Any], bool], optional
+        Function deciding whether a key is kept in the persistent tier.
+        By default every key is.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, default_ttl=None, persistent=None, group_by=None, persist=None):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.persistent = persistent
+        self.group_by = group_by
+        self.persist = persist
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.group_hits = Counter()
+        self.group_misses = Counter()
+        self.group_evictions = Counter()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self._lookup(key) is not None
+
+    def _lookup(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, _ = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key, default=None):
+        """Returns the cached value for ``key``, or ``default`` if it is
+        missing or expired. Counts towards the hit and miss stats.
+
+        Only the in-memory entries are checked; use :meth:`fetch` to
+        also check the persistent tier."""
+        entry = self._lookup(key)
+        if entry is None:
+            self._count_miss(key)
+            return default
+        self._count_hit(key)
+        self._data.move_to_end(key)
+        return entry[1]
+
+    async def fetch(self, key, default=None):
+        """Like :meth:`get`, but misses are looked up in the persistent
+        tier, off the event loop, before being counted."""
+        entry = self._lookup(key)
+        if entry is None and self._persisted(key):
+            stored = await self.persistent.get(key)
+            if stored is not None:
+                value, ttl = stored
+                self._store(key, value, ttl)
+                self._count_hit(key)
+                return value
+        if entry is None:
+            self._count_miss(key)
+            return default
+        self._count_hit(key)
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def _persisted(self, key):
+        return self.persistent is not None and (self.persist is None or self.persist(key))
+
+    def _count_miss(self, key):
+        self.misses += 1
+        if self.group_by:
+            self.group_misses[self.group_by(key)] += 1
+
+    def _count_hit(self, key):
+        self.hits += 1
+        if self.group_by:
+            self.group_hits[self.group_by(key)] += 1
+
+    def set(self, key, value, ttl=None):
+        """Stores ``value`` under ``key`` for ``ttl`` seconds."""
+        ttl = self.default_ttl if ttl is None else ttl
+        self._store(key, value, ttl)
+        if self._persisted(key):
+            self.persistent.set(key, value, ttl)
+
+    async def warm(self, limit=None):
+        """Preloads unexpired entries from the persistent tier.
+
+        Returns the number of entries loaded.
+        """
+        if self.persistent is None:
+            return 0
+        count = 0
+        for key, value, ttl in await self.persistent.load(limit or self.maxsize):
+            self._store(key, value, ttl)
+            count += 1
+        return count
+
+    def _store(self, key, value, ttl):
+        expires = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            evicted, _ = self._data.popitem(last=False)
+            self.evictions += 1
+            if self.group_by:
+                self.group_evictions[self.group_by(evicted)] += 1
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        """Returns a dict of the current size and hit/miss/eviction
+        counters."""
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class PersistentCache:
+    """An on-disk cache tier stored in SQLite, kept across restarts.
+
+    Values must be JSON serialisable or ESI models, and keys are stored
+    as JSON, so tuple keys come back as tuples. Writes are held in memory and
+    written in a single transaction once ``flush_size`` are pending or
+    ``flush_interval`` seconds have passed, and on :meth:`close`.
+
+    The database is only used from one worker thread, so reads and
+    writes never block the event loop and are run in the order made.
+
+    Parameters
+    ----------
+    path: `str`
+        Path of the SQLite file, created if it doesn't exist.
+    flush_interval: `float`, optional
+        Most seconds pending writes are held before being written.
+    flush_size: `int`, optional
+        Most writes held before being written.
+    """
+
+    def __init__(self, path=PERSISTENT_PATH, flush_interval=30, flush_size=100):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._pending = {}
+        self._last_flush = time.monotonic()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix='cache', initializer=self._connect)
+        self._executor.submit(self._create).result()
+
+    def _connect(self):
+        self._local.db = sqlite3.connect(self.path)
+
+    def _create(self):
+        db = self._local.db
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)")
+        db.commit()
+
+    async def _run(self, func, *args):
+        return await asyncio.get_event_loop().run_in_executor(self._executor, func, *args)
+
+    @staticmethod
+    def _encode_key(key):
+        return json.dumps(list(key) if isinstance(key, tuple) else key)
+
+    @staticmethod
+    def _decode_key(key):
+        key = json.loads(key)
+        return tuple(key) if isinstance(key, list) else key
+
+    @staticmethod
+    def _remaining(expires):
+        return None if expires is None else expires - time.time()
+
+    def _select(self, encoded):
+        row = self._local.db.execute("SELECT value, expires FROM cache WHERE key = ?", (encoded,)).fetchone()
+        if not row:
+            return None
+        return json.loads(row[0], object_hook=models.decode), row[1]
+
+    async def get(self, key):
+        """Returns ``(value, ttl)`` for an unexpired entry, otherwise
+        `None`."""
+        encoded = self._encode_key(key)
+        if encoded in self._pending:
+            value, expires = self._pending[encoded]
+        else:
+            row = await self._run(self._select, encoded)
+            if row is None:
+                return None
+            value, expires = row
+        ttl = self._remaining(expires)
+        if ttl is not None and ttl <= 0:
+            return None
+        return value, ttl
+
+    def set(self, key, value, ttl=None):
+        expires = time.time() + ttl if ttl is not None else None
+        self._pending[self._encode_key(key)] = (value, expires)
+        if len(self._pending) >= self.flush_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _load(self, limit):
+        rows = self._local.db.execute(
+            "SELECT key, value, expires FROM cache WHERE expires IS NULL OR expires > ? "
+            "ORDER BY expires IS NULL DESC, expires DESC LIMIT ?",
+            (time.time(), limit)
+        )
+        return [
+            (self._decode_key(key), json.loads(value, object_hook=models.decode), self._remaining(expires))
+            for key, value, expires in rows.fetchall()
+        ]
+
+    async def load(self, limit):
+        """Returns up to ``limit`` unexpired entries as ``(key, value,
+        ttl)``, longest lived first."""
+        self.flush()
+        return await self._run(self._load, limit)
+
+    def _write(self, pending):
+        db = self._local.db
+        try:
+            with db:
+                db.executemany(
+                    "REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                    ((key, json.dumps(value, default=models.encode), expires)
+                     for key, (value, expires) in pending.items())
+                )
+                db.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            log.exception('Failed to write the persistent cache', exc_info=e)
+
+    def flush(self):
+        """Starts writing pending entries and removing expired ones on
+        the worker thread, returning its future."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return None
+        pending, self._pending = self._pending, {}
+        return self._executor.submit(self._write, pending)
+
+    def _close(self):
+        self._local.db.close()
+
+    async def close(self):
+        self.flush()
+        await self._run(self._close)
+        await asyncio.get_event_loop().run_in_executor(None, self._executor.shutdown)
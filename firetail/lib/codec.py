@@ -0,0 +1,99 @@
+"""JSON encoding and decoding for every payload the bot handles.
+
+Uses orjson when it's installed, falling back to the standard library.
+Both decode straight from the response bytes, so there's no need to
+decode to ``str`` first with ``resp.text()`` or ``resp.json()``.
+
+Running ``python -m firetail.lib.codec`` benchmarks both backends on
+payloads shaped like ESI universe lists and zKillboard killmails.
+"""
+
+import json
+import timeit
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson else 'json'
+
+# raised for invalid JSON by either backend, as orjson's error subclasses it
+DecodeError = json.JSONDecodeError
+
+
+if orjson:
+    loads = orjson.loads
+
+    def dumps(obj):
+        """Encodes ``obj`` as compact JSON, returned as a `str`."""
+        return orjson.dumps(obj).decode()
+else:
+    def loads(data):
+        """Decodes JSON from `bytes` or `str`."""
+        return json.loads(data)
+
+    def dumps(obj):
+        """Encodes ``obj`` as compact JSON, returned as a `str`."""
+        return json.dumps(obj, separators=(',', ':'))
+
+
+def _sample_payloads():
+    system_kills = [
+        {'system_id': 30000000 + i, 'ship_kills': i % 40, 'npc_kills': i % 900, 'pod_kills': i % 7}
+        for i in range(5000)
+    ]
+    attackers = [
+        {
+            'character_id': 90000000 + i, 'corporation_id': 98000000 + i, 'alliance_id': 99000000 + i,
+            'damage_done': 1000 + i, 'final_blow': i == 0, 'security_status': -1.5,
+            'ship_type_id': 17738, 'weapon_type_id': 2929,
+        }
+        for i in range(30)
+    ]
+    killmail = {
+        'action': 'killmail',
+        'package': {
+            'killID': 80000000,
+            'killmail': {
+                'killmail_id': 80000000, 'killmail_time': '2020-01-01T00:00:00Z', 'solar_system_id': 30000142,
+                'attackers': attackers,
+                'victim': {
+                    'character_id': 91000000, 'corporation_id': 98500000, 'damage_taken': 45000,
+                    'ship_type_id': 587, 'position': {'x': 1.5e12, 'y': -2.5e11, 'z': 3.1e12},
+                    'items': [
+                        {'flag': 27 + i, 'item_type_id': 2000 + i, 'quantity_destroyed': 1, 'singleton': 0}
+                        for i in range(25)
+                    ],
+                },
+            },
+            'zkb': {
+                'locationID': 40009077, 'hash': 'a' * 40, 'fittedValue': 1e7, 'totalValue': 2.5e7,
+                'points': 10, 'npc': False, 'solo': False, 'awox': False,
+            },
+        },
+    }
+    return {
+        'universe list': json.dumps(system_kills).encode(),
+        'killmail frame': json.dumps(killmail).encode(),
+    }
+
+
+def benchmark(number=200):
+    """Prints the time to decode each sample payload with each backend."""
+    backends = {'json': json.loads}
+    if orjson:
+        backends['orjson'] = orjson.loads
+    for name, payload in _sample_payloads().items():
+        results = {
+            backend: timeit.timeit(lambda: decode(payload), number=number) / number
+            for backend, decode in backends.items()
+        }
+        line = ', '.join(f'{backend} {seconds * 1e6:.1f}us' for backend, seconds in results.items())
+        if 'orjson' in results:
+            line += f" ({results['json'] / results['orjson']:.1f}x)"
+        print(f'{name} ({len(payload)} bytes): {line}')
+
+
+if __name__ == '__main__':
+    benchmark()
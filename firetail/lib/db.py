@@ -1,36 +1,486 @@
 import asyncio
+import contextvars
 import logging
 import os
 import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
+from itertools import groupby
+from operator import itemgetter
 
 logger = logging.getLogger('firetail.db')
 
 DATABASE = 'firetail.sqlite'
 LOCK = asyncio.Lock()
 HERE = os.path.dirname(__file__)
+# numbered scripts applied in order by create_tables, named NNNN_name.sql
+MIGRATIONS = os.path.join(HERE, 'sql', 'migrations')
+READERS = 4
+# connections held by the PostgreSQL backend
+POOL_SIZE = 10
+# queries running longer than this many seconds are logged with their plan
+SLOW_QUERY = 0.1
+# queued writes are committed together this many seconds after the first
+# is queued, or as soon as this many are queued
+WRITE_INTERVAL = 0.5
+WRITE_ROWS = 500
+
+# applied to the writer connection when it's opened
+PRAGMAS = (
+    # lets compact() free pages. only takes effect on a new database, and
+    # must come before switching to WAL, which starts the file
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    # readers no longer block behind writers
+    "PRAGMA journal_mode=WAL",
+    # with WAL, only checkpoints need to be synced to disk
+    "PRAGMA synchronous=NORMAL",
+    # 16MiB page cache, given in KiB when negative
+    "PRAGMA cache_size=-16384",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+# applied to each reader connection when it's opened
+READER_PRAGMAS = (
+    "PRAGMA query_only=ON",
+    "PRAGMA cache_size=-4096",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+_database = None
+_statements = {}
+_slow_query = SLOW_QUERY
+# slow query logging in progress, referenced so it isn't garbage collected
+_slow_tasks = set()
+
+
+class QueueStats:
+    """Contention statistics for one of the database's queues.
+
+    ``pending`` is the number of calls submitted and not yet finished,
+    and wait times are from a call being submitted to a thread starting
+    it.
+    """
+    __slots__ = ('pending', 'peak', 'calls', 'wait_sum', 'wait_max', 'run_sum')
+
+    def __init__(self):
+        self.pending = 0
+        self.peak = 0
+        self.calls = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.run_sum = 0.0
+
+    @property
+    def mean_wait(self):
+        return self.wait_sum / self.calls if self.calls else 0
+
+    @property
+    def mean_run(self):
+        return self.run_sum / self.calls if self.calls else 0
+
+
+class StatementStats:
+    """Timing statistics for one SQL statement, over all calls of it.
+
+    ``wait`` is the time spent waiting for a connection, and ``run`` the
+    time spent running the statement. ``callers`` counts calls by the
+    name of the calling module, such as the cog's.
+    """
+    __slots__ = ('calls', 'wait_sum', 'run_sum', 'run_max', 'rows', 'slow', 'callers', 'plan')
+
+    def __init__(self):
+        self.calls = 0
+        self.wait_sum = 0.0
+        self.run_sum = 0.0
+        self.run_max = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.callers = Counter()
+        self.plan = None
+
+    @property
+    def mean_wait(self):
+        return self.wait_sum / self.calls if self.calls else 0
+
+    @property
+    def mean_run(self):
+        return self.run_sum / self.calls if self.calls else 0
+
+
+class Storage:
+    """Interface of the storage backends :func:`open_db` can open.
+
+    The functions of this module are written for sqlite, and hand each
+    call to the open backend's :meth:`run` along with the function
+    called. Backends for other databases implement each of them as a
+    coroutine method of the same name, taking the same arguments less
+    ``db``, and returning ``(result, wait, run)``: the result along with
+    the seconds spent waiting for a connection and running the call.
+
+    Attributes
+    ----------
+    stats: Dict[str, QueueStats]
+        Contention statistics of the backend's ``'read'`` and ``'write'``
+        queues.
+    """
+    stats = None
+
+    async def run(self, func, *args, readonly=False, **kwargs):
+        return await getattr(self, func.__name__)(*args, **kwargs)
+
+    async def explain(self, sql, var=()):
+        """Returns the query plan of ``sql`` as lines of text."""
+        raise NotImplementedError
+
+    async def close(self):
+        raise NotImplementedError
+
+
+class SQLiteStorage(Storage):
+    """Runs database access in threads, off the event loop.
+
+    Writes go to a single writer thread, so they're applied one at a
+    time in the order they're made. Reads are spread over a pool of
+    read-only connections, which with WAL don't wait on the writer or on
+    each other.
+
+    Parameters
+    ----------
+    path: `str`, optional
+        Path of the sqlite database.
+    readers: `int`, optional
+        Number of read-only connections.
+    """
+
+    def __init__(self, path=DATABASE, readers=READERS):
+        self.path = path
+        self.stats = {'read': QueueStats(), 'write': QueueStats()}
+        self._local = threading.local()
+        self._connections = []
+        self._writer = ThreadPoolExecutor(
+            1, thread_name_prefix='firetail-db-writer', initializer=self._connect, initargs=(False,)
+        )
+        # the writer creates the database and switches it to WAL before
+        # any reader connects
+        self._writer.submit(lambda: None).result()
+        self._readers = ThreadPoolExecutor(
+            readers, thread_name_prefix='firetail-db-reader', initializer=self._connect, initargs=(True,)
+        )
+
+    def _connect(self, readonly):
+        if readonly:
+            conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+            pragmas = READER_PRAGMAS
+        else:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            pragmas = PRAGMAS
+        for pragma in pragmas:
+            conn.execute(pragma)
+        self._local.db = conn
+        self._connections.append(conn)
+
+    def _call(self, func, args, kwargs, submitted):
+        started = time.monotonic()
+        result = _call(func, args, kwargs, self._local.db)
+        return result, started - submitted, time.monotonic() - started
+
+    async def run(self, func, *args, readonly=False, **kwargs):
+        """Calls ``func`` in a reader thread if ``readonly``, otherwise in
+        the writer thread, passing that thread's connection as ``db``."""
+        stats = self.stats['read' if readonly else 'write']
+        executor = self._readers if readonly else self._writer
+        stats.pending += 1
+        stats.peak = max(stats.peak, stats.pending)
+        loop = asyncio.get_running_loop()
+        try:
+            result, wait, run = await loop.run_in_executor(
+                executor, self._call, func, args, kwargs, time.monotonic()
+            )
+        finally:
+            stats.pending -= 1
+        stats.calls += 1
+        stats.wait_sum += wait
+        stats.wait_max = max(stats.wait_max, wait)
+        stats.run_sum += run
+        return result, wait, run
+
+    async def explain(self, sql, var=()):
+        rows, _, _ = await self.run(_explain, sql, var, readonly=True)
+        return [row[3] for row in rows]
+
+    async def close(self):
+        """Waits for queued calls to finish, then closes all connections."""
+        await asyncio.get_event_loop().run_in_executor(None, self._shutdown)
+
+    def _shutdown(self):
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        for conn in self._connections:
+            conn.close()
+        self._connections.clear()
+
+
+class WriteBehind:
+    """Queues writes that don't need to be awaited, and commits them
+    together in one transaction.
+
+    Queued writes are committed in the order they're queued, ``interval``
+    seconds after the first of a batch is queued, or once ``max_rows`` are
+    queued. They aren't visible to reads until then, so callers needing to
+    read back what they've queued should await :meth:`flush` first. Writes
+    made directly through :func:`db_access` functions await it too, so
+    they're never overtaken by earlier queued writes.
+
+    A batch that fails to commit is retried once after ``interval``
+    seconds, then dropped and counted in ``failed``.
+
+    Parameters
+    ----------
+    interval: `float`, optional
+        Most seconds a queued write waits to be committed.
+    max_rows: `int`, optional
+        Number of queued writes that triggers an immediate commit.
+    """
 
+    def __init__(self, interval=WRITE_INTERVAL, max_rows=WRITE_ROWS):
+        self.interval = interval
+        self.max_rows = max_rows
+        self.pending = []
+        self.flushes = 0
+        self.rows = 0
+        self.failed = 0
+        self._handle = None
+        self._tasks = set()
+        # batches being committed, in the order they were taken off the queue
+        self._committing = []
+
+    @property
+    def busy(self):
+        """Whether any writes are queued or being committed."""
+        return bool(self.pending or self._committing)
+
+    def add(self, sql, var=()):
+        self.pending.append((sql, var))
+        if len(self.pending) == self.max_rows:
+            self._start_flush()
+        elif self._handle is None:
+            self._handle = asyncio.get_running_loop().call_later(self.interval, self._start_flush)
+
+    def _start_flush(self):
+        task = asyncio.ensure_future(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self):
+        """Commits all queued writes, and waits for any already being
+        committed."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        statements, self.pending = self.pending, []
+        if statements:
+            previous = self._committing[-1] if self._committing else None
+            commit = asyncio.ensure_future(self._commit(statements, previous))
+            self._committing.append(commit)
+            commit.add_done_callback(self._committing.remove)
+        if self._committing:
+            await asyncio.shield(self._committing[-1])
+
+    async def _commit(self, statements, previous):
+        _committing_queue.set(True)
+        if previous is not None:
+            # committed in turn, so a retried batch isn't overtaken
+            await asyncio.wait([previous])
+        for attempt in range(2):
+            try:
+                await execute_batch(statements)
+            except Exception:
+                if attempt:
+                    self.failed += len(statements)
+                    logger.exception(f'Dropped {len(statements)} queued writes that failed to commit twice')
+                    return
+                logger.warning(f'Failed to commit {len(statements)} queued writes, retrying', exc_info=True)
+                await asyncio.sleep(self.interval)
+            else:
+                self.flushes += 1
+                self.rows += len(statements)
+                return
+
+
+_write_behind = WriteBehind()
+# set while committing queued writes, which mustn't wait on the queue
+_committing_queue = contextvars.ContextVar('committing_queue', default=False)
+
+
+async def open_db(path=DATABASE, readers=READERS, write_interval=WRITE_INTERVAL, write_rows=WRITE_ROWS, url=None,
+                  pool_size=POOL_SIZE, slow_query=SLOW_QUERY):
+    """Opens the :class:`Storage` used for all database access, and sets
+    how often writes queued with :func:`queue_write` are committed, and
+    the seconds after which a query is logged as slow.
+
+    This is the sqlite database at ``path``, unless ``url`` is given for
+    a PostgreSQL database, which requires asyncpg.
+
+    Until this is called, each access opens and closes its own sqlite
+    connection on the event loop.
+    """
+    global _database, _slow_query
+    _slow_query = slow_query
+    _write_behind.interval = write_interval
+    _write_behind.max_rows = write_rows
+    if _database is None:
+        if url:
+            from .postgres import PostgresStorage
+            _database = await PostgresStorage.open(url, pool_size)
+        else:
+            _database = SQLiteStorage(path, readers)
+    return _database
+
+
+async def close_db():
+    """Closes the database opened by :func:`open_db`.
+
+    Writes still queued are lost, so :func:`flush` should be awaited
+    first.
+    """
+    global _database
+    if _write_behind.pending:
+        logger.warning(f'Closing with {len(_write_behind.pending)} queued writes uncommitted')
+    if _database is not None:
+        await _database.close()
+        _database = None
 
-def db_access(func):
-    """Decorator to ensure sync access to the sqlite db.
 
-    Functions decorated with this will have it's access to the sqlite db
-    controlled by a global lock to ensure only one access at a time.
-    If it's being accessed by another call, it will wait until it's turn
-    for aquiring access.
+def queue_write(sql, var=()):
+    """Queues a write to be committed with others by the
+    :class:`WriteBehind` queue, for writes that don't need to be
+    awaited.
+
+    Parameters
+    ----------
+    sql: `str`
+        SQL statement to be executed.
+    var: `tuple`, optional
+        Tuple of values to replace placeholders.
+    """
+    _write_behind.add(sql, var)
+
+
+async def flush():
+    """Commits all writes queued with :func:`queue_write`."""
+    await _write_behind.flush()
+
+
+def write_behind_stats():
+    """Returns the :class:`WriteBehind` queue, for its ``pending``,
+    ``flushes``, ``rows`` and ``failed`` counts."""
+    return _write_behind
+
+
+def backend():
+    """Returns the open :class:`Storage`, or ``None`` if it isn't open."""
+    return _database
+
+
+def stats():
+    """Returns the :class:`QueueStats` of the read and write queues, by
+    ``'read'`` and ``'write'``, or ``None`` if the database isn't open."""
+    return _database.stats if _database is not None else None
+
+
+def statement_stats():
+    """Returns the :class:`StatementStats` of each statement run, by
+    statement."""
+    return _statements
+
+
+def _explain(sql, var=(), *, db=None):
+    return db.execute(f'EXPLAIN QUERY PLAN {sql}', var).fetchall()
+
+
+def _caller(frame):
+    module = frame.f_globals.get('__name__', '') if frame else ''
+    return module.rsplit('.', 1)[-1]
+
+
+def _record(func, args, kwargs, caller, wait, run, result, readonly):
+    sql = args[0] if args and isinstance(args[0], str) else None
+    key = ' '.join(sql.split()) if sql else func.__name__
+    stats = _statements.get(key)
+    if stats is None:
+        stats = _statements[key] = StatementStats()
+    stats.calls += 1
+    stats.wait_sum += wait
+    stats.run_sum += run
+    stats.run_max = max(stats.run_max, run)
+    stats.callers[caller] += 1
+    if readonly:
+        stats.rows += len(result) if isinstance(result, list) else int(result is not None)
+    if run >= _slow_query:
+        stats.slow += 1
+        if sql and _database is not None:
+            var = kwargs.get('var', args[1] if len(args) > 1 else ())
+            if isinstance(var, list):
+                # execute_many's rows, planned with the first
+                var = var[0] if var else ()
+            task = asyncio.ensure_future(_log_slow(key, sql, var if isinstance(var, tuple) else (), caller, wait, run))
+            _slow_tasks.add(task)
+            task.add_done_callback(_slow_tasks.discard)
+
+
+async def _log_slow(key, sql, var, caller, wait, run):
+    stats = _statements[key]
+    if stats.plan is None:
+        try:
+            stats.plan = await _database.explain(sql, var)
+        except Exception:
+            stats.plan = []
+    plan = '\n    '.join(stats.plan) or 'unavailable'
+    logger.warning(
+        f'Slow query from {caller}: {run * 1000:.0f}ms running, {wait * 1000:.0f}ms waiting\n'
+        f'    {key}\nPlan:\n    {plan}'
+    )
+
+
+def _call(func, args, kwargs, db):
+    try:
+        return func(*args, db=db, **kwargs)
+    except sqlite3.Warning as e:
+        logger.exception(type(e).__name__, exc_info=e)
+        return None
+    except sqlite3.Error:
+        # don't leave a failed transaction open on a shared connection
+        if db.in_transaction:
+            db.rollback()
+        raise
+
+
+def db_access(func=None, *, readonly=False):
+    """Decorator to run access to the sqlite db off the event loop.
+
+    Functions decorated with this are run by the :class:`Storage`
+    opened with :func:`open_db`. For sqlite that's in its writer thread,
+    so writes happen one at a time, or with ``readonly=True`` in one of
+    its reader threads. If the database isn't open, access is controlled
+    by a global lock to ensure only one access at a time, and runs on
+    the event loop.
 
     .. note::
 
-        As the wait is controlled by an asyncio.Lock, the returned
-        function is a coroutine, so must be awaited.
+        The returned function is a coroutine, so must be awaited.
 
-    SQlite exceptions are caught by the wrapper, logged, and the data
+    SQlite warnings are caught by the wrapper, logged, and the data
     returned as `None`.
 
     A wrapped function must have the optional ``db`` keyword-only
     argument, as it will inject the sqlite3 connection instance for the
     default db, or if an alternative is provided, it will pass it
-    instead.
+    instead, calling the function directly.
 
     Example
     -------
@@ -41,32 +491,47 @@ def db_access(func):
         def create_tables(*, db=None):
             ...
 
+        @db_access(readonly=True)
+        def select(sql, single=False, *, db=None):
+            ...
+
     """
-    def get_db():
-        return sqlite3.connect(DATABASE)
+    if func is None:
+        return lambda f: db_access(f, readonly=readonly)
 
     @wraps(func)
     async def access_control(*args, db=None, **kwargs):
-        async with LOCK:
-            if not db:
-                db = get_db()
-            try:
-                return func(*args, db=db, **kwargs)
-            except sqlite3.Warning as e:
-                logger.exception(type(e).__name__, exc_info=e)
-                return None
-            finally:
-                db.close()
+        caller = _caller(sys._getframe(1))
+        if not (readonly or db or _committing_queue.get()) and _write_behind.busy:
+            await _write_behind.flush()
+        submitted = time.monotonic()
+        if db:
+            result = _call(func, args, kwargs, db)
+            wait, run = 0, time.monotonic() - submitted
+        elif _database is not None:
+            result, wait, run = await _database.run(func, *args, readonly=readonly, **kwargs)
+        else:
+            async with LOCK:
+                started = time.monotonic()
+                db = sqlite3.connect(DATABASE)
+                try:
+                    result = _call(func, args, kwargs, db)
+                finally:
+                    db.close()
+                wait, run = started - submitted, time.monotonic() - started
+        _record(func, args, kwargs, caller, wait, run, result, readonly)
+        return result
 
     return access_control
 
 
 @db_access
 def create_tables(*, db=None):
-    """Creates the tables required by the bot if not already existing.
+    """Creates the tables required by the bot if not already existing,
+    then applies any migrations not yet applied.
 
-    Access is controlled with a coroutine wrapper, so this function
-    must be awaited when used.
+    This is run off the event loop by a coroutine wrapper, so this
+    function must be awaited when used.
 
     Parameters
     ----------
@@ -78,14 +543,62 @@ def create_tables(*, db=None):
         sql = f.read()
     db.executescript(sql)
     db.commit()
+    apply_migrations(db)
 
 
-@db_access
+def migrations():
+    """Returns the version and path of each migration script, in the
+    order they're applied."""
+    found = []
+    for name in os.listdir(MIGRATIONS):
+        if name.endswith('.sql'):
+            found.append((int(name.split('_', 1)[0]), os.path.join(MIGRATIONS, name)))
+    return sorted(found)
+
+
+def apply_migrations(db):
+    """Applies the migrations newer than the database's schema version.
+
+    Each migration is applied in its own transaction along with the
+    record of it in the ``schema_version`` table, so a failed migration
+    leaves the database at the previous version.
+
+    Parameters
+    ----------
+    db: `sqlite.Connection`
+        The sqlite database connection.
+
+    Returns
+    -------
+    List[int]
+        The versions applied.
+    """
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS schema_version (version INTEGER PRIMARY KEY, applied_at REAL NOT NULL)"
+    )
+    current = db.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] or 0
+    applied = []
+    for version, path in migrations():
+        if version <= current:
+            continue
+        with open(path, 'r') as f:
+            sql = f.read()
+        db.executescript(
+            f"BEGIN;\n{sql}\n"
+            f"INSERT INTO schema_version (version, applied_at) VALUES ({version}, {time.time()});\n"
+            "COMMIT;"
+        )
+        logger.info(f'Applied database migration {os.path.basename(path)}')
+        applied.append(version)
+    return applied
+
+
+@db_access(readonly=True)
 def select(sql, single=False, *, db=None):
     """Executes a given select query to the sqlite database.
 
-    Access is controlled with a coroutine wrapper, so this function
-    must be awaited when used.
+    This is run off the event loop by a coroutine wrapper, so this
+    function must be awaited when used.
 
     Parameters
     ----------
@@ -116,13 +629,13 @@ def select(sql, single=False, *, db=None):
     return data
 
 
-@db_access
+@db_access(readonly=True)
 def select_var(sql, var, single=False, *, db=None):
     """Executes a given select query to the sqlite database with
     placeholder variables.
 
-    Access is controlled with a coroutine wrapper, so this function
-    must be awaited when used.
+    This is run off the event loop by a coroutine wrapper, so this
+    function must be awaited when used.
 
     Parameters
     ----------
@@ -160,8 +673,8 @@ def execute_sql(sql, var=None, *, db=None):
     """Executes a given query to the sqlite database with optional
     placeholder variable support.
 
-    Access is controlled with a coroutine wrapper, so this function
-    must be awaited when used.
+    This is run off the event loop by a coroutine wrapper, so this
+    function must be awaited when used.
 
     Parameters
     ----------
@@ -183,3 +696,114 @@ def execute_sql(sql, var=None, *, db=None):
     cursor.execute(sql, var)
     db.commit()
     return cursor.lastrowid
+
+
+@db_access
+def execute_many(sql, rows, *, db=None):
+    """Executes a given query to the sqlite database once for each set
+    of placeholder variables, committing them together.
+
+    This is run off the event loop by a coroutine wrapper, so this
+    function must be awaited when used.
+
+    Parameters
+    ----------
+    sql: `str`
+        SQL statement to be executed.
+    rows: Iterable[tuple]
+        Tuples of values to replace placeholders, one for each execution.
+    db: `sqlite.Connection`, optional
+        The sqlite database connection. Not required, unless not using
+        the default database for Firetail.
+
+    Returns
+    -------
+    int
+        The number of rows modified, or None if the backend doesn't
+        report it.
+    """
+    with db:
+        cursor = db.executemany(sql, rows)
+    return cursor.rowcount
+
+
+@db_access
+def execute_batch(statements, *, db=None):
+    """Executes a sequence of queries to the sqlite database in one
+    transaction, so they're all committed or none are.
+
+    This is run off the event loop by a coroutine wrapper, so this
+    function must be awaited when used.
+
+    Parameters
+    ----------
+    statements: Iterable[Tuple[str, tuple]]
+        The SQL statement and placeholder variables of each query, in the
+        order they're to be executed. Consecutive queries with the same
+        statement are executed together.
+    db: `sqlite.Connection`, optional
+        The sqlite database connection. Not required, unless not using
+        the default database for Firetail.
+    """
+    with db:
+        for sql, group in groupby(statements, key=itemgetter(0)):
+            db.executemany(sql, [var for _, var in group])
+
+
+@db_access
+def compact(pages, *, db=None):
+    """Returns up to ``pages`` free pages of the sqlite database to the
+    filesystem with an incremental vacuum.
+
+    Incremental vacuuming needs ``auto_vacuum=INCREMENTAL``. Databases
+    created by :func:`open_db` have it, but older ones only take it
+    after a full ``VACUUM``, which holds the writer for as long as it
+    takes to rewrite the file. That is left to
+    :func:`enable_incremental_vacuum`, run while the bot is stopped, and
+    until then nothing is compacted.
+
+    This is run off the event loop by a coroutine wrapper, so this
+    function must be awaited when used.
+
+    Parameters
+    ----------
+    pages: `int`
+        Most pages to free.
+    db: `sqlite.Connection`, optional
+        The sqlite database connection. Not required, unless not using
+        the default database for Firetail.
+
+    Returns
+    -------
+    Optional[int]
+        The number of pages still free afterwards, or `None` if
+        incremental vacuuming isn't enabled.
+    """
+    if db.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return None
+    db.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+    return db.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+def enable_incremental_vacuum(path=DATABASE):
+    """Switches the sqlite database at ``path`` to incremental vacuuming
+    with a full ``VACUUM``, so :func:`compact` can return its free pages.
+
+    The whole file is rewritten, so this is run offline with the
+    ``--enable-incremental-vacuum`` command line flag rather than by the
+    running bot.
+
+    Returns
+    -------
+    bool
+        `False` if it was already enabled.
+    """
+    db = sqlite3.connect(path)
+    try:
+        if db.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        db.execute("VACUUM")
+        return True
+    finally:
+        db.close()
@@ -1,63 +1,373 @@
-import json
-
-import aiohttp
+import asyncio
+import time
+
+from . import codec
+from .cache import DEFAULT_MAXSIZE, TTLCache, cache_ttl
+from .governor import ErrorLimitGovernor, RETRY_STATUSES
+from .metrics import Metrics
+from .models import Constellation, Corporation, Region, System, Type
+from .names import NameResolver
+from .search import PrefixIndex, STATIC_CATEGORIES, normalise
+from .snapshots import Snapshot
 
 ESI_URL = "https://esi.evetech.net/latest"
 FUZZ_URL = "https://www.fuzzwork.co.uk/api"
 MARKET_URL = "https://market.fuzzwork.co.uk/aggregates"
 OAUTH_URL = "https://login.eveonline.com/oauth/verify"
+ZKILL_URL = "https://zkillboard.com/api"
+ZKILL_WS_URL = "wss://zkillboard.com:2096/"
+
+# most pages of a paginated endpoint requested at once by one call
+PAGE_CONCURRENCY = 5
+
+# how long ESI search results are reused for
+SEARCH_TTL = 3600
+
+# most list responses kept for conditional requests, and for how long; a
+# response older than this is unlikely to still match its ETag
+ETAG_CACHE_SIZE = 1000
+ETAG_TTL = 3600
+
+# celestials never change, so composite lookups are kept for a day
+CELESTIAL_TTL = 86400
+# unknown celestials are retried sooner, in case of a transient failure
+MISSING_CELESTIAL_TTL = 3600
+
+# ID ranges as (start, end) for each kind of celestial
+CELESTIAL_IDS = (40000000, 50000000)
+STARGATE_IDS = (50000000, 60000000)
+STATION_IDS = (60000000, 64000000)
+
+
+# endpoints whose entries describe long-lived entities, and so are worth
+# keeping on disk across restarts; pages and searches go stale quickly
+PERSISTED_ENDPOINTS = frozenset({
+    'system', 'constellation', 'region', 'planet', 'moon', 'asteroid', 'stargate', 'star', 'station',
+    'celestial', 'character', 'corporation', 'alliance', 'item', 'name',
+})
+
+
+def _cache_group(key):
+    """Names the endpoint a cache key belongs to, for cache stats."""
+    return key[0] if isinstance(key, tuple) else 'other'
+
+
+def _persisted(key):
+    return _cache_group(key) in PERSISTED_ENDPOINTS
 
 
 class ESI:
     """Data manager for requesting and returning ESI data."""
 
-    def __init__(self, session):
-        self.session = session
-        self._types_cache = {}
-        self._celestial_cache = {}
-        self._system_cache = {}
-        self._constellation_cache = {}
-        self._region_cache = {}
-        self._planet_cache = {}
-        self._station_cache = {}
-        self._stargate_cache = {}
-        self._star_cache = {}
-        self._moon_cache = {}
-        self._asteroid_cache = {}
+    def __init__(self, transport, cache_size=DEFAULT_MAXSIZE, max_concurrency=20, static=None, persistent=None,
+                 urls=None):
+        # Transport with a pooled session for each upstream
+        self.transport = transport
+        # base URLs, overridable to point at a stand-in server
+        urls = urls or {}
+        self.esi_url = urls.get('esi', ESI_URL)
+        self.fuzz_url = urls.get('fuzzwork', FUZZ_URL)
+        self.market_url = urls.get('market', MARKET_URL)
+        self.zkill_url = urls.get('zkill', ZKILL_URL)
+        # optional StaticStore that answers static lookups without ESI
+        self.static = static
+        self.governor = ErrorLimitGovernor(max_concurrency=max_concurrency)
+        # optional PersistentCache keeps responses across restarts
+        self.cache = TTLCache(
+            maxsize=cache_size, persistent=persistent, group_by=_cache_group, persist=_persisted
+        )
+        self.metrics = Metrics()
+        # last ETag and decoded body of list endpoints, for conditional
+        # requests; entity endpoints are small and cached by model instead
+        self._etags = TTLCache(maxsize=ETAG_CACHE_SIZE, default_ttl=ETAG_TTL)
+        # requests currently awaiting a response, by URL
+        self._inflight = {}
+
+        self.names = NameResolver(self)
+        # name indexes of static search categories, built on first use
+        self._search_indexes = {}
+
+        # universe-wide datasets, indexed by system for point lookups
+        self.system_kills = Snapshot(self, f'{self.esi_url}/universe/system_kills/')
+        self.system_jumps = Snapshot(self, f'{self.esi_url}/universe/system_jumps/')
+        self.sov_map = Snapshot(self, f'{self.esi_url}/sovereignty/map/')
+        self.sov_campaigns = Snapshot(self, f'{self.esi_url}/sovereignty/campaigns/', 'solar_system_id', multi=True)
 
     async def get_data(self, url):
         """Base data retrieval method."""
-        async with self.session.get(url, headers={"Accepts": "application/json"}) as r:
-            try:
-                data = await r.json(content_type=None)
-            except json.JSONDecodeError:
-                return None
+        data, _ = await self._get(url)
         return data
 
+    async def _get(self, url, conditional=False):
+        """Requests ``url`` and returns the decoded data along with how
+        many seconds it may be cached for.
+
+        Concurrent requests for the same URL share a single request.
+        ``conditional`` requests are revalidated by ETag, which is only
+        worth it for large list responses.
+        """
+        data, ttl, _ = await self._get_with_pages(url, conditional)
+        return data, ttl
+
+    async def _get_with_pages(self, url, conditional=False):
+        """Same as :meth:`_get`, also returning the ``X-Pages`` count."""
+        request = self._inflight.get(url)
+        if request is None:
+            request = asyncio.ensure_future(self._fetch(url, conditional))
+            self._inflight[url] = request
+            request.add_done_callback(lambda _: self._inflight.pop(url, None))
+        # shielded so one caller cancelling doesn't cancel it for the rest
+        return await asyncio.shield(request)
+
+    async def _fetch(self, url, conditional=False):
+        """Performs the request for :meth:`_get_with_pages`.
+
+        The TTL is ``None`` for unsuccessful responses, which shouldn't
+        be cached.
+
+        For ``conditional`` requests, if a recent response for ``url``
+        had an ETag, it's sent as ``If-None-Match`` and a ``304 Not
+        Modified`` reply returns the previously decoded body without
+        parsing anything.
+        """
+        headers = {"Accept": "application/json"}
+        previous = self._etags.get(url) if conditional else None
+        if previous:
+            headers['If-None-Match'] = previous[0]
+
+        status, resp_headers, body = await self._request('GET', url, headers=headers)
+        try:
+            pages = int(resp_headers.get('X-Pages', 1))
+        except ValueError:
+            pages = 1
+        if status == 304 and previous:
+            return previous[1], cache_ttl(resp_headers), pages
+        try:
+            data = codec.loads(body)
+        except codec.DecodeError:
+            return None, None, pages
+        if status != 200:
+            return data, None, pages
+        etag = resp_headers.get('ETag')
+        if conditional and etag:
+            self._etags.set(url, (etag, data))
+        return data, cache_ttl(resp_headers), pages
+
+    async def _send(self, method, url, **kwargs):
+        start = time.monotonic()
+        async with self.transport.for_url(url).request(method, url, **kwargs) as r:
+            body = await r.read()
+        self.metrics.record_request(url, r.status, time.monotonic() - start, len(body))
+        return r.status, r.headers, body
+
+    async def _request(self, method, url, **kwargs):
+        """Sends a request, under the error limit governor if it's to
+        ESI. Other hosts have no error limit, and their responses
+        mustn't throttle ESI traffic.
+
+        Responses with a retryable status are retried with backoff, up
+        to the governor's retry count.
+
+        Returns
+        -------
+        Tuple[int, Mapping[str, str], bytes]
+            The status, headers and body of the final response.
+        """
+        attempt = 0
+        while True:
+            if url.startswith(self.esi_url):
+                async with self.governor:
+                    status, headers, body = await self._send(method, url, **kwargs)
+                    self.governor.update(status, headers)
+            else:
+                status, headers, body = await self._send(method, url, **kwargs)
+            if status not in RETRY_STATUSES or attempt >= self.governor.retries:
+                return status, headers, body
+            await asyncio.sleep(self.governor.backoff(attempt))
+            attempt += 1
+
+    async def cached_data(self, endpoint, key, url, allow_cache=True, model=None):
+        """Returns data for ``url``, using the shared cache where possible.
+
+        Parameters
+        ----------
+        endpoint: `str`
+            Name the entry is cached under, such as ``'system'``.
+        key: `Any`
+            Identifier of the entry within the endpoint, usually an ID.
+        url: `str`
+            URL to request on a cache miss.
+        allow_cache: `bool`, optional
+            If `False`, the cache is bypassed for the lookup but is still
+            updated with the fresh response.
+        model: `Type[Model]`, optional
+            Model successful responses are converted to before caching.
+        """
+        if allow_cache:
+            data = await self.cache.fetch((endpoint, key))
+            if data is not None:
+                return data
+
+        data, ttl = await self._get(url)
+        if data and ttl:
+            if model:
+                data = model(data)
+            self.cache.set((endpoint, key), data, ttl)
+        return data
+
+    async def _page(self, url, page):
+        """Returns the rows of one page of ``url`` and the total number of
+        pages, using the shared cache where possible. The rows are `None`
+        if the page couldn't be fetched."""
+        page_url = f"{url}{'&' if '?' in url else '?'}page={page}"
+        cached = self.cache.get(('page', page_url))
+        if cached is not None:
+            return cached[0], cached[1]
+        data, ttl, pages = await self._get_with_pages(page_url, conditional=True)
+        if not isinstance(data, list):
+            return None, pages
+        if ttl:
+            self.cache.set(('page', page_url), (data, pages), ttl)
+        return data, pages
+
+    def _remaining_pages(self, url, pages, max_concurrency):
+        """Starts fetching pages 2 to ``pages`` of ``url``, with at most
+        ``max_concurrency`` in flight. Returns a future of each page's
+        rows."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(page):
+            async with semaphore:
+                return (await self._page(url, page))[0]
+
+        return [asyncio.ensure_future(fetch(page)) for page in range(2, pages + 1)]
+
+    async def iter_paged(self, url, max_concurrency=PAGE_CONCURRENCY):
+        """Yields every row of a paginated endpoint.
+
+        The first page is fetched to find the page count from its
+        ``X-Pages`` header, then the remaining pages are fetched
+        concurrently, at most ``max_concurrency`` at a time. Rows are
+        yielded as soon as their page arrives, so pages after the first
+        may arrive out of order. Pages that fail are skipped.
+        """
+        rows, pages = await self._page(url, 1)
+        if rows is None:
+            return
+        for row in rows:
+            yield row
+
+        requests = self._remaining_pages(url, pages, max_concurrency)
+        try:
+            for request in asyncio.as_completed(requests):
+                for row in await request or []:
+                    yield row
+        finally:
+            # stop fetching if the caller stops iterating early
+            for request in requests:
+                request.cancel()
+
+    async def get_paged(self, url, max_concurrency=PAGE_CONCURRENCY):
+        """Returns the rows of every page of a paginated endpoint as one
+        list, in page order.
+
+        Pages are fetched as in :meth:`iter_paged`. Returns `None` if any
+        page couldn't be fetched, rather than incomplete results.
+        """
+        rows, pages = await self._page(url, 1)
+        if rows is None:
+            return None
+        rest = await asyncio.gather(*self._remaining_pages(url, pages, max_concurrency))
+        if any(page is None for page in rest):
+            return None
+        return rows + [row for page in rest for row in page]
+
+    async def post_names(self, ids):
+        """Resolves a batch of IDs through ``/universe/names/``.
+
+        Returns the list of results and how many seconds they may be
+        cached for. If any ID is invalid, ESI rejects the whole batch and
+        the results are `None`.
+
+        Most callers should use :attr:`names` instead, which batches and
+        caches lookups.
+        """
+        url = f'{self.esi_url}/universe/names/'
+        status, headers, body = await self._request(
+            'POST', url, data=codec.dumps(list(ids)),
+            headers={"Accept": "application/json", "Content-Type": "application/json"}
+        )
+        if status == 404:
+            return None, None
+        if status != 200:
+            return [], None
+        try:
+            data = codec.loads(body)
+        except codec.DecodeError:
+            return [], None
+        return data, cache_ttl(headers)
+
     async def server_info(self):
-        url = f'{ESI_URL}/status/'
+        url = f'{self.esi_url}/status/'
         return await self.get_data(url)
 
     async def esi_search(self, item, category, force_strict=False):
+        """Searches for IDs in ``category`` matching ``item``.
+
+        Static categories are answered from the static data store when it
+        holds a matching name, exact matches first, then names starting
+        with ``item``. Other searches go to ESI, with results cached by
+        their case-folded search term.
+        """
+        term = normalise(item)
+        data = self._local_search(term, category, force_strict)
+        if data:
+            return data
+
+        key = ('search', category, term, force_strict)
+        data = self.cache.get(key)
+        if data is None:
+            data = await self._esi_search(term, category, force_strict)
+            if data is None:
+                return None
+            self.cache.set(key, data, SEARCH_TTL)
+        return data if category in data else None
+
+    def _local_search(self, term, category, force_strict):
+        index = self._search_indexes.get(category)
+        if index is None:
+            if not self.static or category not in STATIC_CATEGORIES:
+                return None
+            index = self._search_indexes[category] = PrefixIndex(self.static.names(category))
+        ids = index.exact(term)
+        if not ids and not force_strict:
+            ids = index.prefix(term)
+        return {category: ids} if ids else None
+
+    async def _esi_search(self, item, category, force_strict):
+        """Requests a search from ESI, returning `None` if the request
+        failed."""
         strict = 'true' if force_strict else 'false'
 
         url = ('{0}/search/?categories={1}&datasource=tranquility'
                '&language=en-us&search={2}&strict={3}')
 
         data = await self.get_data(
-            url.format(ESI_URL, category, item, strict)
+            url.format(self.esi_url, category, item, strict)
         )
 
-        if category not in data:
+        if not isinstance(data, dict) or 'error' in data:
             return None
+        if category not in data:
+            return data
 
         # if multiple, try stricter search
         if len(data[category]) > 1 and not force_strict:
             strict_data = await self.get_data(url.format(
-                ESI_URL, category, item, 'true'))
+                self.esi_url, category, item, 'true'))
 
             # if no strict results, use non-strict results
-            if category not in strict_data:
+            if not isinstance(strict_data, dict) or category not in strict_data:
                 return data
 
             data = strict_data
@@ -73,156 +383,176 @@ class ESI:
 
     # Location Stuff
 
-    # Catch all for unknown ID
-    async def celestial_info(self, celestial_id, allow_cache=True):
+    async def celestial_type(self, celestial_id, system_id=None):
+        """Works out what kind of celestial an ID belongs to.
+
+        Stargates and stations have their own ID ranges. Planets, moons,
+        stars and asteroid belts share a range, so they're told apart by
+        finding the ID in the layout of ``system_id``.
+
+        Returns
+        -------
+        Optional[str]
+            One of ``'planet'``, ``'moon'``, ``'star'``, ``'asteroid'``,
+            ``'stargate'`` or ``'station'``, or `None` if the type is
+            unknown.
+        """
+        if not celestial_id:
+            return None
+        if STARGATE_IDS[0] <= celestial_id < STARGATE_IDS[1]:
+            return 'stargate'
+        if STATION_IDS[0] <= celestial_id < STATION_IDS[1]:
+            return 'station'
+        if not (CELESTIAL_IDS[0] <= celestial_id < CELESTIAL_IDS[1]) or not system_id:
+            return None
+
+        system = await self.system_info(system_id)
+        if not isinstance(system, System):
+            return None
+        if system.star_id == celestial_id:
+            return 'star'
+        if celestial_id in system.planets:
+            return 'planet'
+        if celestial_id in system.moons:
+            return 'moon'
+        if celestial_id in system.asteroid_belts:
+            return 'asteroid'
+        return None
+
+    async def celestial_info(self, celestial_id, allow_cache=True, system_id=None):
+        """Returns info for a celestial of unknown type.
+
+        Giving the ``system_id`` the celestial is in allows its type to be
+        found without probing, so only the matching endpoint is requested.
+        Without it, the planet, moon, star and asteroid belt endpoints
+        are tried in turn. Celestials that can't be found are cached as
+        an empty dict for a shorter time.
+        """
         if allow_cache:
-            if celestial_id in self._celestial_cache:
-                return self._celestial_cache[celestial_id]
-
-        location_info = await self.planet_info(celestial_id)
-        if 'name' not in location_info.keys():
-            location_info = await self.stargate_info(celestial_id)
-            if 'name' not in location_info.keys():
-                location_info = await self.star_info(celestial_id)
-                if 'name' not in location_info.keys():
-                    location_info = await self.station_info(celestial_id)
-                    if 'name' not in location_info.keys():
-                        location_info = await self.moon_info(celestial_id)
-                        if 'name' not in location_info.keys():
-                            location_info = await self.asteroid_info(celestial_id)
-                            if 'name' not in location_info.keys():
-                                location_info = {}
-
-        if location_info != 0:
-            self._celestial_cache[celestial_id] = location_info
+            location_info = await self.cache.fetch(('celestial', celestial_id))
+            if location_info is not None:
+                return location_info
+
+        if self.static and celestial_id:
+            location_info = self.static.celestial(celestial_id)
+            if location_info:
+                return location_info
+
+        lookups = {
+            'planet': self.planet_info,
+            'moon': self.moon_info,
+            'star': self.star_info,
+            'asteroid': self.asteroid_info,
+            'stargate': self.stargate_info,
+            'station': self.station_info,
+        }
+        kind = await self.celestial_type(celestial_id, system_id)
+        if kind:
+            candidates = [lookups[kind]]
+        elif celestial_id and CELESTIAL_IDS[0] <= celestial_id < CELESTIAL_IDS[1]:
+            candidates = [self.planet_info, self.moon_info, self.star_info, self.asteroid_info]
+        else:
+            candidates = []
+
+        location_info = {}
+        for lookup in candidates:
+            data = await lookup(celestial_id)
+            if data and 'name' in data:
+                location_info = data
+                break
+
+        ttl = CELESTIAL_TTL if location_info else MISSING_CELESTIAL_TTL
+        self.cache.set(('celestial', celestial_id), location_info, ttl)
         return location_info
 
-    async def system_info(self, system_id):
-        url = f'{ESI_URL}/universe/systems/{system_id}/'
-        return await self.get_data(url)
+    async def system_info(self, system_id, allow_cache=True):
+        if self.static:
+            data = self.static.system(system_id)
+            if data:
+                return System(data)
+        url = f'{self.esi_url}/universe/systems/{system_id}/'
+        return await self.cached_data('system', system_id, url, allow_cache, System)
 
     async def system_name(self, system_id):
-        url = f'{ESI_URL}/universe/systems/{system_id}/'
-        data = await self.get_data(url)
-        if not data:
-            return None
-        return data.get('name')
+        return await self.names.name(system_id)
 
     async def constellation_info(self, constellation_id, allow_cache=True):
-        if allow_cache:
-            if constellation_id in self._constellation_cache:
-                return self._constellation_cache[constellation_id]
-
-        url = f'{ESI_URL}/universe/constellations/{constellation_id}/'
-        data = await self.get_data(url)
-        if data:
-            self._constellation_cache[constellation_id] = data
-        return data
+        if self.static:
+            data = self.static.constellation(constellation_id)
+            if data:
+                return Constellation(data)
+        url = f'{self.esi_url}/universe/constellations/{constellation_id}/'
+        return await self.cached_data('constellation', constellation_id, url, allow_cache, Constellation)
 
     async def region_info(self, region_id, allow_cache=True):
-        if allow_cache:
-            if region_id in self._region_cache:
-                return self._region_cache[region_id]
-
-        url = f'{ESI_URL}/universe/regions/{region_id}/'
-        data = await self.get_data(url)
-        if data:
-            self._region_cache[region_id] = data
-        return data
+        if self.static:
+            data = self.static.region(region_id)
+            if data:
+                return Region(data)
+        url = f'{self.esi_url}/universe/regions/{region_id}/'
+        return await self.cached_data('region', region_id, url, allow_cache, Region)
 
     async def planet_info(self, planet_id, allow_cache=True):
-        if allow_cache:
-            if planet_id in self._planet_cache:
-                return self._planet_cache[planet_id]
-
-        url = f'{ESI_URL}/universe/planets/{planet_id}/'
-        data = await self.get_data(url)
-        if data:
-            self._planet_cache[planet_id] = data
-        return data
+        url = f'{self.esi_url}/universe/planets/{planet_id}/'
+        return await self.cached_data('planet', planet_id, url, allow_cache)
 
     async def moon_info(self, moon_id, allow_cache=True):
-        if allow_cache:
-            if moon_id in self._moon_cache:
-                return self._moon_cache[moon_id]
-
-        url = f'{ESI_URL}/universe/moons/{moon_id}/'
-        data = await self.get_data(url)
-        if data:
-            self._moon_cache[moon_id] = data
-        return data
+        url = f'{self.esi_url}/universe/moons/{moon_id}/'
+        return await self.cached_data('moon', moon_id, url, allow_cache)
 
     async def asteroid_info(self, asteroid_id, allow_cache=True):
-        if allow_cache:
-            if asteroid_id in self._asteroid_cache:
-                return self._asteroid_cache[asteroid_id]
-
-        url = f'{ESI_URL}/universe/asteroid_belts/{asteroid_id}/'
-        data = await self.get_data(url)
-        if data:
-            self._asteroid_cache[asteroid_id] = data
-        return data
+        url = f'{self.esi_url}/universe/asteroid_belts/{asteroid_id}/'
+        return await self.cached_data('asteroid', asteroid_id, url, allow_cache)
 
     async def stargate_info(self, stargate_id, allow_cache=True):
-        if allow_cache:
-            if stargate_id in self._stargate_cache:
-                return self._stargate_cache[stargate_id]
-
-        url = f'{ESI_URL}/universe/stargates/{stargate_id}/'
-        data = await self.get_data(url)
-        if data:
-            self._stargate_cache[stargate_id] = data
-        return data
+        if self.static:
+            data = self.static.stargate(stargate_id)
+            if data:
+                return data
+        url = f'{self.esi_url}/universe/stargates/{stargate_id}/'
+        return await self.cached_data('stargate', stargate_id, url, allow_cache)
 
     async def star_info(self, star_id, allow_cache=True):
-        if allow_cache:
-            if star_id in self._star_cache:
-                return self._star_cache[star_id]
-
-        url = f'{ESI_URL}/universe/stars/{star_id}/'
-        data = await self.get_data(url)
-        if data:
-            self._star_cache[star_id] = data
-        return data
+        url = f'{self.esi_url}/universe/stars/{star_id}/'
+        return await self.cached_data('star', star_id, url, allow_cache)
 
     async def station_info(self, station_id, allow_cache=True):
-        if allow_cache:
-            if station_id in self._station_cache:
-                return self._station_cache[station_id]
-
-        url = f'{ESI_URL}/universe/stations/{station_id}/'
-        data = await self.get_data(url)
-        if data:
-            self._station_cache[station_id] = data
-        return data
+        url = f'{self.esi_url}/universe/stations/{station_id}/'
+        return await self.cached_data('station', station_id, url, allow_cache)
 
     async def get_jump_info(self, system_id=None):
-        url = f'{ESI_URL}/universe/system_jumps/'
-        data = await self.get_data(url)
-        if not data:
-            return None
-
-        if system_id:
-            for system in data:
-                if system['system_id'] == system_id:
-                    return system['ship_jumps']
-            return 0
-        else:
-            return data
+        if not system_id:
+            return await self.system_jumps.all() or None
+        system = await self.system_jumps.get(system_id)
+        return system['ship_jumps'] if system else 0
+
+    async def get_kill_info(self, system_id):
+        """Returns the ship, NPC and pod kills in the last hour for a
+        system as a tuple."""
+        system = await self.system_kills.get(system_id)
+        if not system:
+            return 0, 0, 0
+        return system['ship_kills'], system['npc_kills'], system['pod_kills']
+
+    async def get_sov_info(self, system_id):
+        """Returns the sovereignty map entry for a system, if any."""
+        return await self.sov_map.get(system_id)
 
     async def get_incursion_info(self):
-        url = f'{ESI_URL}/incursions/'
+        url = f'{self.esi_url}/incursions/'
         return await self.get_data(url)
 
-    async def get_active_sov_battles(self):
-        url = f'{ESI_URL}/sovereignty/campaigns/?datasource=tranquility'
-        return await self.get_data(url)
+    async def get_active_sov_battles(self, system_id=None):
+        """Returns all sov campaigns, or only those in ``system_id``."""
+        if system_id:
+            return await self.sov_campaigns.get(system_id, [])
+        return await self.sov_campaigns.all()
 
     # Character Stuff
 
-    async def character_info(self, character_id):
-        url = f'{ESI_URL}/characters/{character_id}/'
-        return await self.get_data(url)
+    async def character_info(self, character_id, allow_cache=True):
+        url = f'{self.esi_url}/characters/{character_id}/'
+        return await self.cached_data('character', character_id, url, allow_cache)
 
     async def character_corp_id(self, character_id):
         data = await self.character_info(character_id)
@@ -230,9 +560,9 @@ class ESI:
             return None
         return data.get('corporation_id')
 
-    async def corporation_info(self, corporation_id):
-        url = f'{ESI_URL}/corporations/{corporation_id}/'
-        return await self.get_data(url)
+    async def corporation_info(self, corporation_id, allow_cache=True):
+        url = f'{self.esi_url}/corporations/{corporation_id}/'
+        return await self.cached_data('corporation', corporation_id, url, allow_cache, Corporation)
 
     async def character_alliance_id(self, character_id):
         data = await self.character_info(character_id)
@@ -240,34 +570,29 @@ class ESI:
             return None
         return data.get('alliance_id')
 
-    async def alliance_info(self, alliance_id):
-        url = f'{ESI_URL}/alliances/{alliance_id}/'
-        return await self.get_data(url)
+    async def alliance_info(self, alliance_id, allow_cache=True):
+        url = f'{self.esi_url}/alliances/{alliance_id}/'
+        return await self.cached_data('alliance', alliance_id, url, allow_cache)
 
     async def character_name(self, character_id):
-        data = await self.character_info(character_id)
-        if not data:
-            return None
-        return data.get('name')
+        return await self.names.name(character_id)
 
     # Item Stuff
 
     async def item_id(self, item_name):
-        url = f'{FUZZ_URL}/typeid.php?typename={item_name}'
+        url = f'{self.fuzz_url}/typeid.php?typename={item_name}'
         data = await self.get_data(url)
         if not data:
             return None
         return data.get('typeID')
 
     async def item_info(self, item_id, allow_cache=True):
-        if allow_cache:
-            if item_id in self._types_cache:
-                return self._types_cache[item_id]
-        url = f'{ESI_URL}/universe/types/{item_id}/'
-        data = await self.get_data(url)
-        if data:
-            self._types_cache[item_id] = data
-        return data
+        if self.static:
+            data = self.static.type(item_id)
+            if data:
+                return Type(data)
+        url = f'{self.esi_url}/universe/types/{item_id}/'
+        return await self.cached_data('item', item_id, url, allow_cache, Type)
 
     async def market_data(self, item_name, station):
         results = await self.esi_search(item_name, 'inventory_type')
@@ -275,7 +600,7 @@ class ESI:
             return None
 
         item_id = results['inventory_type'][0]
-        url = f'{MARKET_URL}/?station={station}&types={item_id}'
+        url = f'{self.market_url}/?station={station}&types={item_id}'
         data = await self.get_data(url)
         if not data:
             return None
@@ -289,26 +614,26 @@ class ESI:
         params = {'grant_type': 'refresh_token',
                   'refresh_token': refresh_token}
 
-        sess = self.session
+        sess = self.transport.esi
         async with sess.get(OAUTH_URL, params=params, headers=header) as r:
-            try:
-                data = await r.json()
-            except aiohttp.ContentTypeError:
-                return None
-            return data
+            body = await r.read()
+        try:
+            return codec.loads(body)
+        except codec.DecodeError:
+            return None
 
     async def verify_token(self, access_token):
         header = {'Authorization': f'Bearer {access_token}'}
 
-        async with self.session.get(OAUTH_URL, headers=header) as r:
-            try:
-                data = await r.json()
-            except aiohttp.ContentTypeError:
-                return None
-            return data
+        async with self.transport.esi.get(OAUTH_URL, headers=header) as r:
+            body = await r.read()
+        try:
+            return codec.loads(body)
+        except codec.DecodeError:
+            return None
 
     # Token Restricted
 
     async def notifications(self, alliance_id):
-        url = f'{ESI_URL}/alliances/{alliance_id}/'
+        url = f'{self.esi_url}/alliances/{alliance_id}/'
         return await self.get_data(url)
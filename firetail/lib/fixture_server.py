@@ -0,0 +1,308 @@
+"""Local stand-in for ESI, zKillboard and Fuzzwork, for running Firetail's
+network paths offline and benchmarking them reproducibly.
+
+Responses are recorded from the real services into a fixtures directory
+with::
+
+    python -m firetail.lib.fixture_server record --out DIR URL [URL ...] [--killmails N]
+
+and served back with::
+
+    python -m firetail.lib.fixture_server serve --fixtures DIR [--latency MS] [--error-rate RATE]
+
+The fixtures directory holds ``http.json``, mapping each recorded URL to
+its response, and ``killmails.jsonl``, one zKillboard WebSocket frame per
+line. Only GET requests are recorded; ESI's ``POST /universe/names/`` is
+answered from the names in the recorded entity responses.
+
+While serving, each upstream is available under its own path, such as
+``http://127.0.0.1:8080/esi``; the URLs to put in the bot's
+``upstream_urls`` and ``zkill_ws_url`` config are logged on start.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import time
+from email.utils import formatdate
+
+import aiohttp
+import websockets
+from aiohttp import web
+
+from .cache import cache_ttl
+from .esi import ESI_URL, FUZZ_URL, MARKET_URL, ZKILL_URL, ZKILL_WS_URL
+
+log = logging.getLogger(__name__)
+
+# upstreams served, by the path prefix and config key they're served under
+UPSTREAMS = {
+    'esi': ESI_URL,
+    'zkill': ZKILL_URL,
+    'fuzzwork': FUZZ_URL,
+    'market': MARKET_URL,
+}
+HTTP_FIXTURES = 'http.json'
+KILLMAIL_FIXTURES = 'killmails.jsonl'
+
+# ESI's error limit, emulated so the bot's error limit handling is exercised
+ERROR_LIMIT = 100
+ERROR_WINDOW = 60
+
+NAMES_PATH = 'universe/names/'
+# names endpoint categories of the ESI entity endpoints, by path
+NAME_CATEGORIES = {
+    'characters': 'character',
+    'corporations': 'corporation',
+    'alliances': 'alliance',
+    'universe/systems': 'solar_system',
+    'universe/constellations': 'constellation',
+    'universe/regions': 'region',
+    'universe/stations': 'station',
+    'universe/types': 'inventory_type',
+}
+_ENTITY_PATH = re.compile(rf'^({"|".join(NAME_CATEGORIES)})/(\d+)/?$')
+
+
+def _load_fixtures(path):
+    http_path = os.path.join(path, HTTP_FIXTURES)
+    killmail_path = os.path.join(path, KILLMAIL_FIXTURES)
+    responses = {}
+    killmails = []
+    if os.path.exists(http_path):
+        with open(http_path, encoding='utf-8') as f:
+            responses = json.load(f)
+    if os.path.exists(killmail_path):
+        with open(killmail_path, encoding='utf-8') as f:
+            killmails = [line.strip() for line in f if line.strip()]
+    return responses, killmails
+
+
+def _recorded_names(responses):
+    """Returns the names endpoint's info for each entity in the recorded
+    ESI responses, by ID."""
+    names = {}
+    prefix = f'{ESI_URL}/'
+    for url, recorded in responses.items():
+        if not url.startswith(prefix) or recorded.get('status') != 200:
+            continue
+        match = _ENTITY_PATH.match(url[len(prefix):])
+        if not match:
+            continue
+        try:
+            name = json.loads(recorded['body']).get('name')
+        except (ValueError, AttributeError):
+            continue
+        if name:
+            id_ = int(match.group(2))
+            names[id_] = {'id': id_, 'name': name, 'category': NAME_CATEGORIES[match.group(1)]}
+    return names
+
+
+class FixtureServer:
+    """Serves recorded responses with injected latency and errors.
+
+    Parameters
+    ----------
+    responses: Mapping[str, dict]
+        Recorded responses by upstream URL, as written by :func:`record`.
+    killmails: List[str]
+        Recorded WebSocket frames, replayed in order.
+    latency: `float`, optional
+        Seconds added to every response.
+    jitter: `float`, optional
+        Most extra seconds randomly added to every response.
+    error_rate: `float`, optional
+        Chance of any response being replaced by an error.
+    error_statuses: Sequence[int], optional
+        Statuses injected errors are picked from.
+    rate: `float`, optional
+        Killmail frames sent per second to each WebSocket client.
+    """
+
+    def __init__(self, responses, killmails, latency=0, jitter=0, error_rate=0, error_statuses=(502, 503, 504),
+                 rate=1):
+        self.responses = responses
+        self.killmails = killmails
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.rate = rate
+        self.requests = 0
+        self.names = _recorded_names(responses)
+        self._errors = 0
+        self._window_start = time.monotonic()
+
+    def _error_limit_headers(self, status):
+        now = time.monotonic()
+        if status >= 400:
+            self._errors += 1
+        return {
+            'X-ESI-Error-Limit-Remain': str(max(ERROR_LIMIT - self._errors, 0)),
+            'X-ESI-Error-Limit-Reset': str(max(int(ERROR_WINDOW - (now - self._window_start)), 0)),
+        }
+
+    async def _resolve_names(self, request):
+        """Answers a names request with the recorded IDs among those
+        asked for. Unlike ESI, unknown IDs are left out rather than
+        failing the request, so lookups of IDs that weren't recorded
+        don't use up the error limit."""
+        try:
+            ids = await request.json()
+        except ValueError:
+            return {'status': 400, 'body': '{"error": "Invalid body"}'}
+        found = [self.names[id_] for id_ in ids if id_ in self.names]
+        return {'status': 200, 'body': json.dumps(found)}
+
+    async def _lookup(self, upstream, request):
+        if request.method == 'POST':
+            if upstream == 'esi' and request.match_info['path'] == NAMES_PATH:
+                return await self._resolve_names(request)
+            return None
+        base = f'{UPSTREAMS[upstream]}/{request.match_info["path"]}'
+        if request.query_string:
+            recorded = self.responses.get(f'{base}?{request.query_string}')
+            if recorded:
+                return recorded
+        return self.responses.get(base)
+
+    async def handle(self, request):
+        self.requests += 1
+        upstream = request.match_info['upstream']
+        if upstream not in UPSTREAMS:
+            raise web.HTTPNotFound()
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if time.monotonic() - self._window_start >= ERROR_WINDOW:
+            self._window_start = time.monotonic()
+            self._errors = 0
+
+        headers = {'Date': formatdate(usegmt=True)}
+        recorded = await self._lookup(upstream, request)
+        if upstream == 'esi' and self._errors >= ERROR_LIMIT:
+            status, body = 420, '{"error": "This software has exceeded the error limit for ESI."}'
+        elif random.random() < self.error_rate:
+            status, body = random.choice(self.error_statuses), '{"error": "Injected error"}'
+        elif recorded is None:
+            status, body = 404, '{"error": "Not found"}'
+        else:
+            status, body = recorded['status'], recorded['body']
+            if recorded.get('ttl') is not None:
+                headers['Expires'] = formatdate(time.time() + recorded['ttl'], usegmt=True)
+            if recorded.get('pages'):
+                headers['X-Pages'] = str(recorded['pages'])
+            etag = recorded.get('etag')
+            if etag:
+                headers['ETag'] = etag
+                if request.headers.get('If-None-Match') == etag:
+                    status, body = 304, None
+        if upstream == 'esi':
+            headers.update(self._error_limit_headers(status))
+        return web.Response(status=status, text=body, headers=headers, content_type='application/json')
+
+    async def stream(self, websocket, path=None):
+        """Replays the recorded killmails to a WebSocket client once it
+        has subscribed, looping back to the start when they run out."""
+        await websocket.recv()
+        if not self.killmails:
+            return await websocket.wait_closed()
+        i = 0
+        while True:
+            await websocket.send(self.killmails[i % len(self.killmails)])
+            i += 1
+            await asyncio.sleep(1 / self.rate)
+
+    async def serve(self, host='127.0.0.1', port=8080, ws_port=8081):
+        app = web.Application()
+        app.router.add_route('*', '/{upstream}/{path:.*}', self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        urls = {name: f'http://{host}:{port}/{name}' for name in UPSTREAMS}
+        log.info(
+            f'Serving {len(self.responses)} responses and {len(self.names)} names: upstream_urls = {urls!r}'
+        )
+        async with websockets.serve(self.stream, host, ws_port):
+            log.info(f"Replaying {len(self.killmails)} killmails: zkill_ws_url = 'ws://{host}:{ws_port}/'")
+            await asyncio.Event().wait()
+
+
+async def record(out, urls, killmails=0):
+    """Records responses for ``urls``, and ``killmails`` frames from the
+    zKillboard WebSocket, into the fixtures directory ``out``.
+
+    Existing recordings in ``out`` are kept unless re-recorded.
+    """
+    os.makedirs(out, exist_ok=True)
+    responses, _ = _load_fixtures(out)
+    async with aiohttp.ClientSession() as session:
+        for url in urls:
+            async with session.get(url) as resp:
+                body = await resp.text()
+                responses[url] = {
+                    'status': resp.status,
+                    'ttl': cache_ttl(resp.headers),
+                    'etag': resp.headers.get('ETag'),
+                    'pages': int(resp.headers.get('X-Pages', 0)) or None,
+                    'body': body,
+                }
+            log.info(f'Recorded {url} ({resp.status})')
+    with open(os.path.join(out, HTTP_FIXTURES), 'w', encoding='utf-8') as f:
+        json.dump(responses, f)
+
+    if killmails:
+        async with websockets.connect(ZKILL_WS_URL) as websocket:
+            await websocket.send(json.dumps({'action': 'sub', 'channel': 'killstream'}))
+            with open(os.path.join(out, KILLMAIL_FIXTURES), 'w', encoding='utf-8') as f:
+                for i in range(killmails):
+                    f.write(f'{await websocket.recv()}\n')
+                    log.info(f'Recorded killmail {i + 1}/{killmails}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stand-in server for the services Firetail uses.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    serve_parser = sub.add_parser('serve', help='Serve recorded responses.')
+    serve_parser.add_argument('--fixtures', required=True, help='Directory of recorded responses.')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8080, help='Port for HTTP requests.')
+    serve_parser.add_argument('--ws-port', type=int, default=8081, help='Port for the killmail WebSocket.')
+    serve_parser.add_argument('--latency', type=float, default=0, help='Milliseconds added to every response.')
+    serve_parser.add_argument('--jitter', type=float, default=0, help='Most random milliseconds also added.')
+    serve_parser.add_argument('--error-rate', type=float, default=0, help='Chance of a response being an error.')
+    serve_parser.add_argument('--rate', type=float, default=1, help='Killmails sent per second.')
+    record_parser = sub.add_parser('record', help='Record responses from the real services.')
+    record_parser.add_argument('--out', required=True, help='Directory to record responses into.')
+    record_parser.add_argument('--urls', help='File listing URLs to record, one per line.')
+    record_parser.add_argument('--killmails', type=int, default=0, help='Number of killmails to record.')
+    record_parser.add_argument('url', nargs='*', help='URLs to record.')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'serve':
+        responses, killmails = _load_fixtures(args.fixtures)
+        server = FixtureServer(
+            responses, killmails, latency=args.latency / 1000, jitter=args.jitter / 1000,
+            error_rate=args.error_rate, rate=args.rate
+        )
+        try:
+            asyncio.run(server.serve(args.host, args.port, args.ws_port))
+        except KeyboardInterrupt:
+            pass
+    elif args.command == 'record':
+        urls = list(args.url)
+        if args.urls:
+            with open(args.urls, encoding='utf-8') as f:
+                urls.extend(line.strip() for line in f if line.strip())
+        asyncio.run(record(args.out, urls, args.killmails))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import random
+import time
+
+log = logging.getLogger(__name__)
+
+# responses worth retrying, as they're usually transient
+RETRY_STATUSES = frozenset({502, 503, 504})
+# ESI's response when the error limit has been exceeded
+ERROR_LIMITED = 420
+
+
+class ErrorLimitGovernor:
+    """Keeps ESI requests within the error limit.
+
+    ESI reports how many more errors it will accept in the current
+    window with the ``X-ESI-Error-Limit-Remain`` header, and when the
+    window resets with ``X-ESI-Error-Limit-Reset``. Going over the limit
+    gets the bot's IP blocked, so the governor:
+
+    - caps the number of requests in flight, lowering the cap as the
+      remaining error budget shrinks;
+    - pauses all requests until the window resets once the budget is
+      nearly spent, or if ESI responds with a 420;
+    - provides jittered exponential backoff for retrying server errors.
+
+    Used as an async context manager around each request, with
+    :meth:`update` called with every response.
+
+    Parameters
+    ----------
+    max_concurrency: `int`, optional
+        Most requests allowed in flight with a full error budget.
+    slow_down_at: `int`, optional
+        Remaining errors below which concurrency starts being reduced.
+    pause_at: `int`, optional
+        Remaining errors at or below which requests are paused until the
+        window resets.
+    retries: `int`, optional
+        How many times a request failing with a retryable status should
+        be retried.
+    """
+
+    def __init__(self, max_concurrency=20, slow_down_at=50, pause_at=10, retries=3):
+        self.max_concurrency = max_concurrency
+        self.slow_down_at = slow_down_at
+        self.pause_at = pause_at
+        self.retries = retries
+        self.remain = None
+        self.reset = None
+        self.in_flight = 0
+        self.paused_until = 0
+        self.pauses = 0
+        self._updated = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self):
+        """Current cap on requests in flight."""
+        if self.remain is None or self.remain >= self.slow_down_at:
+            return self.max_concurrency
+        return max(1, self.max_concurrency * self.remain // self.slow_down_at)
+
+    @property
+    def paused(self):
+        return time.monotonic() < self.paused_until
+
+    async def __aenter__(self):
+        async with self._condition:
+            while True:
+                if self.paused:
+                    delay = self.paused_until - time.monotonic()
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < self.limit:
+                    break
+                await self._condition.wait()
+            self.in_flight += 1
+
+    async def __aexit__(self, *exc_info):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def update(self, status, headers):
+        """Updates the error budget from a response."""
+        remain = headers.get('X-ESI-Error-Limit-Remain')
+        reset = headers.get('X-ESI-Error-Limit-Reset')
+        if remain is not None and reset is not None:
+            try:
+                self.remain = int(remain)
+                self.reset = int(reset)
+                self._updated = time.monotonic()
+            except ValueError:
+                pass
+
+        if status == ERROR_LIMITED or (self.remain is not None and self.remain <= self.pause_at):
+            self.pause(self.reset if self.reset is not None else 60)
+
+    def pause(self, seconds):
+        """Holds back all new requests for ``seconds``."""
+        until = time.monotonic() + seconds
+        if until > self.paused_until:
+            log.warning(f'ESI error limit nearly reached, pausing requests for {seconds}s')
+            self.paused_until = until
+            self.pauses += 1
+
+    def backoff(self, attempt):
+        """Seconds to wait before retry number ``attempt``, starting at 0."""
+        return random.uniform(0, min(30, 0.5 * 2 ** attempt))
+
+    def state(self):
+        """Returns a dict describing the current error budget and load."""
+        reset = self.reset
+        if reset is not None:
+            reset = max(0, reset - int(time.monotonic() - self._updated))
+        return {
+            'errors_remaining': self.remain,
+            'reset_in': reset,
+            'in_flight': self.in_flight,
+            'limit': self.limit,
+            'paused_for': max(0, round(self.paused_until - time.monotonic())),
+            'pauses': self.pauses,
+        }
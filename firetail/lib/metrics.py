@@ -0,0 +1,130 @@
+import contextvars
+import re
+from collections import Counter
+from urllib.parse import urlsplit
+
+# upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+
+# the command being run, so requests can be attributed to it
+current_command = contextvars.ContextVar('current_command', default=None)
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_name(url):
+    """Returns ``url`` with numeric path segments replaced by ``{id}``
+    and the query dropped, so requests are grouped by endpoint."""
+    parts = urlsplit(url)
+    return f'{parts.netloc}{_ID_SEGMENT.sub("/{id}", parts.path)}'
+
+
+class EndpointStats:
+    __slots__ = ('requests', 'statuses', 'bytes', 'latency_sum', 'buckets')
+
+    def __init__(self):
+        self.requests = 0
+        self.statuses = Counter()
+        self.bytes = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    @property
+    def mean_latency(self):
+        return self.latency_sum / self.requests if self.requests else 0
+
+
+class Metrics:
+    """Collects request and cache statistics for the ESI client.
+
+    Requests are grouped by endpoint as given by :func:`endpoint_name`.
+    Cache statistics are read from the cache when exported.
+    """
+
+    def __init__(self):
+        self.endpoints = {}
+        self.commands = Counter()
+        self.command_requests = Counter()
+
+    def record_request(self, url, status, seconds, size):
+        endpoint = endpoint_name(url)
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        stats.requests += 1
+        stats.statuses[status] += 1
+        stats.bytes += size
+        stats.latency_sum += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                stats.buckets[i] += 1
+                break
+        command = current_command.get()
+        if command:
+            self.command_requests[command] += 1
+
+    def record_command(self, command):
+        self.commands[command] += 1
+
+    def slowest(self, limit=5):
+        """Returns ``(endpoint, stats)`` for the endpoints with the highest
+        mean latency."""
+        return sorted(self.endpoints.items(), key=lambda e: e[1].mean_latency, reverse=True)[:limit]
+
+    def busiest(self, limit=5):
+        """Returns ``(endpoint, stats)`` for the most requested endpoints."""
+        return sorted(self.endpoints.items(), key=lambda e: e[1].requests, reverse=True)[:limit]
+
+    def requests_per_command(self):
+        """Returns the mean number of requests each command makes."""
+        return {command: self.command_requests[command] / count for command, count in self.commands.items()}
+
+    def openmetrics(self, cache=None):
+        """Returns all metrics in the OpenMetrics text format, including
+        the per-group statistics of ``cache`` if given."""
+        lines = [
+            '# TYPE firetail_esi_requests counter',
+            '# HELP firetail_esi_requests Requests made, by endpoint and status.',
+        ]
+        for endpoint, stats in sorted(self.endpoints.items()):
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'firetail_esi_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+        lines += [
+            '# TYPE firetail_esi_received_bytes counter',
+            '# HELP firetail_esi_received_bytes Response body bytes received, by endpoint.',
+        ]
+        for endpoint, stats in sorted(self.endpoints.items()):
+            lines.append(f'firetail_esi_received_bytes_total{{endpoint="{endpoint}"}} {stats.bytes}')
+        lines += [
+            '# TYPE firetail_esi_request_seconds histogram',
+            '# HELP firetail_esi_request_seconds Request latency, by endpoint.',
+        ]
+        for endpoint, stats in sorted(self.endpoints.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else bound
+                labels = f'endpoint="{endpoint}",le="{le}"'
+                lines.append(f'firetail_esi_request_seconds_bucket{{{labels}}} {cumulative}')
+            lines.append(f'firetail_esi_request_seconds_sum{{endpoint="{endpoint}"}} {stats.latency_sum}')
+            lines.append(f'firetail_esi_request_seconds_count{{endpoint="{endpoint}"}} {stats.requests}')
+        caches = (
+            ('hits', cache.group_hits, 'Cache lookups answered from the cache'),
+            ('misses', cache.group_misses, 'Cache lookups not in the cache'),
+            ('evictions', cache.group_evictions, 'Entries evicted to make room'),
+        ) if cache is not None else ()
+        for name, counter, help_text in caches:
+            lines += [
+                f'# TYPE firetail_esi_cache_{name} counter',
+                f'# HELP firetail_esi_cache_{name} {help_text}, by cache name.',
+            ]
+            for group, count in sorted(counter.items()):
+                lines.append(f'firetail_esi_cache_{name}_total{{cache="{group}"}} {count}')
+        lines += [
+            '# TYPE firetail_esi_command_requests counter',
+            '# HELP firetail_esi_command_requests Requests made while running each command.',
+        ]
+        for command, count in sorted(self.command_requests.items()):
+            lines.append(f'firetail_esi_command_requests_total{{command="{command}"}} {count}')
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
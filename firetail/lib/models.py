@@ -0,0 +1,126 @@
+"""Compact models of the ESI entities the cogs use.
+
+Full ESI responses carry many fields that are never read, such as the
+moons and asteroid belts nested in each planet of a system, or the
+description and dogma attributes of a type. The models below keep only
+what's used, in slotted objects, so cached entities take a fraction of
+the memory of the decoded JSON.
+
+Models can be indexed like the dicts they replace, so ``system['name']``
+and ``system.get('stargates')`` keep working. Fields that were missing
+from the response are `None` and act as missing keys.
+"""
+
+
+class Model:
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ' '.join(f'{k}={v!r}' for k, v in self.to_dict().items() if not isinstance(v, tuple))
+        return f'<{type(self).__name__} {fields}>'
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuilds a model from the output of :meth:`to_dict`."""
+        model = cls.__new__(cls)
+        for key in cls.__slots__:
+            value = data.get(key)
+            setattr(model, key, tuple(value) if isinstance(value, list) else value)
+        return model
+
+
+class System(Model):
+    __slots__ = (
+        'system_id', 'name', 'constellation_id', 'security_status', 'star_id', 'planets', 'moons',
+        'asteroid_belts', 'stargates'
+    )
+
+    def __init__(self, data):
+        self.system_id = data.get('system_id')
+        self.name = data.get('name')
+        self.constellation_id = data.get('constellation_id')
+        self.security_status = data.get('security_status')
+        self.star_id = data.get('star_id')
+        planets = data.get('planets', [])
+        self.planets = tuple(p['planet_id'] for p in planets)
+        self.moons = tuple(m for p in planets for m in p.get('moons', []))
+        self.asteroid_belts = tuple(b for p in planets for b in p.get('asteroid_belts', []))
+        # systems without gates, such as wormholes, have no stargates key
+        stargates = data.get('stargates')
+        self.stargates = tuple(stargates) if stargates is not None else None
+
+
+class Constellation(Model):
+    __slots__ = ('constellation_id', 'name', 'region_id', 'systems')
+
+    def __init__(self, data):
+        self.constellation_id = data.get('constellation_id')
+        self.name = data.get('name')
+        self.region_id = data.get('region_id')
+        self.systems = tuple(data.get('systems', []))
+
+
+class Region(Model):
+    __slots__ = ('region_id', 'name', 'constellations')
+
+    def __init__(self, data):
+        self.region_id = data.get('region_id')
+        self.name = data.get('name')
+        self.constellations = tuple(data.get('constellations', []))
+
+
+class Type(Model):
+    __slots__ = ('type_id', 'name', 'group_id', 'published')
+
+    def __init__(self, data):
+        self.type_id = data.get('type_id')
+        self.name = data.get('name')
+        self.group_id = data.get('group_id')
+        self.published = data.get('published')
+
+
+class Corporation(Model):
+    __slots__ = ('name', 'ticker', 'member_count', 'alliance_id', 'description')
+
+    def __init__(self, data):
+        self.name = data.get('name')
+        self.ticker = data.get('ticker')
+        self.member_count = data.get('member_count')
+        self.alliance_id = data.get('alliance_id')
+        self.description = data.get('description')
+
+
+MODELS = {cls.__name__: cls for cls in (System, Constellation, Region, Type, Corporation)}
+
+
+def encode(obj):
+    """``default`` hook for :func:`json.dumps` that serialises models."""
+    if isinstance(obj, Model):
+        return {'__model__': type(obj).__name__, **obj.to_dict()}
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def decode(data):
+    """``object_hook`` for :func:`json.loads` that rebuilds models
+    serialised by :func:`encode`."""
+    model = MODELS.get(data.get('__model__'))
+    return model.from_dict(data) if model else data
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+# most IDs the names endpoint accepts per request
+MAX_BATCH = 1000
+# how long to gather IDs before sending a batch
+BATCH_DELAY = 0.01
+
+
+class NameResolver:
+    """Resolves EVE IDs to names in batches using ``/universe/names/``.
+
+    IDs requested within ``delay`` seconds of each other are gathered
+    and looked up together, up to ``MAX_BATCH`` at a time. Results are
+    stored in the ESI cache under the ``'name'`` endpoint as dicts with
+    ``id``, ``name`` and ``category`` keys.
+
+    Parameters
+    ----------
+    esi: `ESI`
+        The ESI data manager used to make requests.
+    delay: `float`, optional
+        Seconds to wait for more IDs before sending a batch.
+    """
+
+    def __init__(self, esi, delay=BATCH_DELAY):
+        self._esi = esi
+        self.delay = delay
+        self._pending = {}
+        self._flush_handle = None
+
+    async def resolve(self, ids):
+        """Returns a dict of ID to cached name info for the given IDs.
+
+        IDs that ESI doesn't recognise are left out of the result.
+        """
+        results = {}
+        waiting = {}
+        loop = asyncio.get_event_loop()
+        for id_ in set(ids):
+            if not id_:
+                continue
+            info = await self._esi.cache.fetch(('name', id_))
+            if info is None and self._esi.static:
+                info = self._esi.static.name(id_)
+            if info is not None:
+                results[id_] = info
+                continue
+            future = self._pending.get(id_)
+            if future is None:
+                future = loop.create_future()
+                self._pending[id_] = future
+            waiting[id_] = future
+
+        if waiting and self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.delay, self._start_flush)
+
+        for id_, future in waiting.items():
+            info = await future
+            if info is not None:
+                results[id_] = info
+        return results
+
+    async def name(self, id_):
+        """Returns the name for a single ID, or `None` if not found."""
+        info = (await self.resolve([id_])).get(id_)
+        return info['name'] if info else None
+
+    async def names(self, ids):
+        """Returns a dict of ID to name for the given IDs."""
+        return {id_: info['name'] for id_, info in (await self.resolve(ids)).items()}
+
+    def _start_flush(self):
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        asyncio.ensure_future(self._flush(pending))
+
+    async def _flush(self, pending):
+        ids = list(pending)
+        try:
+            for i in range(0, len(ids), MAX_BATCH):
+                found = await self._lookup(ids[i:i + MAX_BATCH])
+                for id_ in ids[i:i + MAX_BATCH]:
+                    future = pending[id_]
+                    if not future.done():
+                        future.set_result(found.get(id_))
+        except Exception as e:
+            log.exception('Name resolution failed', exc_info=e)
+            for future in pending.values():
+                if not future.done():
+                    future.set_result(None)
+
+    async def _lookup(self, ids):
+        """Looks up a batch of IDs, splitting it if ESI rejects it.
+
+        The names endpoint fails the whole request if any ID is invalid,
+        so a rejected batch is halved until the bad IDs are isolated.
+        """
+        data, ttl = await self._esi.post_names(ids)
+        if data is not None:
+            found = {}
+            for info in data:
+                found[info['id']] = info
+                if ttl:
+                    self._esi.cache.set(('name', info['id']), info, ttl)
+            return found
+
+        if len(ids) == 1:
+            return {}
+        half = len(ids) // 2
+        found = await self._lookup(ids[:half])
+        found.update(await self._lookup(ids[half:]))
+        return found
@@ -0,0 +1,223 @@
+"""PostgreSQL storage backend, so several bot processes can share the
+subscriptions, trackers and tokens otherwise held in one process's sqlite
+file.
+
+Opened by :func:`firetail.lib.db.open_db` when ``database_url`` is set in
+the config. The statements used throughout the bot are written for sqlite,
+so they're translated when first run: ``?`` placeholders become ``$n``,
+backtick quoting is dropped, and ``REPLACE INTO`` becomes an upsert that,
+like sqlite's, resets the columns it doesn't set.
+
+Requires asyncpg.
+"""
+
+import logging
+import os
+import re
+import time
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+from .db import HERE, QueueStats, Storage, migrations
+
+log = logging.getLogger(__name__)
+
+# held while creating tables and migrating, so processes starting together
+# don't migrate at the same time
+MIGRATION_LOCK = 0x66697265
+
+# columns REPLACE INTO conflicts on, for tables with a unique column
+UPSERT_KEYS = {
+    'firetail': 'entry',
+    'eve_rpg_channels': 'server_id',
+    'eve_rpg_players': 'player_id',
+    'rss_channels': 'channel_id',
+    'prefixes': 'guild_id',
+    'access_tokens': 'refresh_token',
+}
+
+_STRINGS = re.compile(r"('(?:[^']|'')*')")
+_REPLACE = re.compile(r'^\s*REPLACE\s+INTO\s+(\w+)\s*\(([^)]*)\)', re.IGNORECASE)
+_INSERT = re.compile(r'^\s*INSERT\s+INTO\s+(\w+)', re.IGNORECASE)
+
+
+def _placeholders(sql):
+    parts = _STRINGS.split(sql)
+    count = 0
+    for i in range(0, len(parts), 2):
+        pieces = parts[i].replace('`', '"').split('?')
+        numbered = [pieces[0]]
+        for piece in pieces[1:]:
+            count += 1
+            numbered.append(f'${count}{piece}')
+        parts[i] = ''.join(numbered)
+    return ''.join(parts)
+
+
+class PostgresStorage(Storage):
+    """Runs database access on a pool of asyncpg connections.
+
+    Use :meth:`open` to create one.
+
+    Parameters
+    ----------
+    pool: `asyncpg.pool.Pool`
+        The connection pool.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.stats = {'read': QueueStats(), 'write': QueueStats()}
+        # columns of each table, filled in by create_tables
+        self.columns = {}
+        self._translate = lru_cache(maxsize=None)(self._translate_uncached)
+
+    @classmethod
+    async def open(cls, url, pool_size):
+        if asyncpg is None:
+            raise RuntimeError('asyncpg is required for a PostgreSQL database_url')
+        pool = await asyncpg.create_pool(url, min_size=1, max_size=pool_size)
+        return cls(pool)
+
+    async def close(self):
+        await self.pool.close()
+
+    def _translate_uncached(self, sql, returning):
+        replace = _REPLACE.match(sql)
+        if replace:
+            table = replace.group(1)
+            sql = f'INSERT INTO{sql[replace.start(1) - 1:]}'
+            key = UPSERT_KEYS.get(table)
+            given = [column.strip() for column in replace.group(2).split(',')]
+            if key in given:
+                updates = [f'{column} = EXCLUDED.{column}' for column in given if column != key]
+                updates += [
+                    f'{column} = DEFAULT' for column in self.columns.get(table, ())
+                    if column not in given and column not in ('id', key)
+                ]
+                sql = f'{sql.rstrip().rstrip(";")} ON CONFLICT ({key}) DO UPDATE SET {", ".join(updates)}'
+        insert = _INSERT.match(sql)
+        if returning and insert and 'id' in self.columns.get(insert.group(1), ()):
+            # returned in place of sqlite's lastrowid
+            sql = f'{sql.rstrip().rstrip(";")} RETURNING id'
+        return _placeholders(sql)
+
+    async def _acquire(self, readonly):
+        stats = self.stats['read' if readonly else 'write']
+        stats.pending += 1
+        stats.peak = max(stats.peak, stats.pending)
+        submitted = time.monotonic()
+        try:
+            conn = await self.pool.acquire()
+        except BaseException:
+            stats.pending -= 1
+            raise
+        started = time.monotonic()
+        stats.wait_sum += started - submitted
+        stats.wait_max = max(stats.wait_max, started - submitted)
+        return conn, stats, started - submitted
+
+    async def _with_connection(self, readonly, coro_func):
+        """Calls ``coro_func`` with a pooled connection, returning its
+        result with the seconds spent waiting for the connection and
+        running."""
+        conn, stats, wait = await self._acquire(readonly)
+        started = time.monotonic()
+        try:
+            result = await coro_func(conn)
+        finally:
+            run = time.monotonic() - started
+            await self.pool.release(conn)
+            stats.pending -= 1
+            stats.calls += 1
+            stats.run_sum += run
+        return result, wait, run
+
+    async def create_tables(self):
+        with open(os.path.join(HERE, 'sql', 'postgres', 'tables.sql'), 'r') as f:
+            tables = f.read()
+
+        async def create(conn):
+            async with conn.transaction():
+                await conn.execute('SELECT pg_advisory_xact_lock($1)', MIGRATION_LOCK)
+                await conn.execute(tables)
+                current = await conn.fetchval('SELECT MAX(version) FROM schema_version') or 0
+                for version, path in migrations():
+                    if version <= current:
+                        continue
+                    with open(path, 'r') as f:
+                        await conn.execute(f.read())
+                    await conn.execute(
+                        'INSERT INTO schema_version (version, applied_at) VALUES ($1, $2)', version, time.time()
+                    )
+                    log.info(f'Applied database migration {os.path.basename(path)}')
+            rows = await conn.fetch(
+                'SELECT table_name, column_name FROM information_schema.columns '
+                'WHERE table_schema = current_schema() ORDER BY ordinal_position'
+            )
+            for table, group in groupby(sorted(rows, key=itemgetter(0)), key=itemgetter(0)):
+                self.columns[table] = [row[1] for row in group]
+            self._translate.cache_clear()
+
+        return await self._with_connection(False, create)
+
+    async def explain(self, sql, var=()):
+        sql = self._translate(sql, False)
+
+        async def fetch(conn):
+            return [row[0] for row in await conn.fetch(f'EXPLAIN {sql}', *var)]
+
+        plan, _, _ = await self._with_connection(True, fetch)
+        return plan
+
+    async def compact(self, pages):
+        # space is reclaimed by the server's autovacuum
+        return 0, 0, 0
+
+    async def select(self, sql, single=False):
+        return await self.select_var(sql, (), single)
+
+    async def select_var(self, sql, var, single=False):
+        sql = self._translate(sql, False)
+
+        async def fetch(conn):
+            if single:
+                row = await conn.fetchrow(sql, *var)
+                return row[0] if row else None
+            return [tuple(row) for row in await conn.fetch(sql, *var)]
+
+        return await self._with_connection(True, fetch)
+
+    async def execute_sql(self, sql, var=None):
+        sql = self._translate(sql, True)
+
+        async def execute(conn):
+            if sql.endswith('RETURNING id'):
+                return await conn.fetchval(sql, *(var or ()))
+            await conn.execute(sql, *(var or ()))
+            return None
+
+        return await self._with_connection(False, execute)
+
+    async def execute_many(self, sql, rows):
+        sql = self._translate(sql, False)
+
+        async def execute(conn):
+            async with conn.transaction():
+                await conn.executemany(sql, rows)
+
+        return await self._with_connection(False, execute)
+
+    async def execute_batch(self, statements):
+        async def execute(conn):
+            async with conn.transaction():
+                for sql, group in groupby(statements, key=itemgetter(0)):
+                    await conn.executemany(self._translate(sql, False), [var for _, var in group])
+
+        return await self._with_connection(False, execute)
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+
+from . import db
+
+log = logging.getLogger(__name__)
+
+DAY = 86400
+# rows deleted per statement, and the pause between statements so other
+# writes aren't held up behind a large prune
+BATCH_SIZE = 500
+BATCH_PAUSE = 0.1
+# free pages returned to the filesystem on each run
+VACUUM_PAGES = 1000
+# minutes between runs
+INTERVAL = 60
+
+
+class Policy:
+    """How long the rows of a table are kept.
+
+    Parameters
+    ----------
+    table: `str`
+        Name of the table, which must have an ``id`` primary key.
+    max_age: `float`, optional
+        Seconds after which a row is deleted, by the timestamp in
+        ``age_column``.
+    age_column: `str`, optional
+        Column holding each row's time as a Unix timestamp.
+    max_rows: `int`, optional
+        Most rows kept for each value of ``group_column``, deleting the
+        oldest first.
+    group_column: `str`, optional
+        Column the ``max_rows`` limit applies to each value of.
+    """
+    __slots__ = ('table', 'max_age', 'age_column', 'max_rows', 'group_column')
+
+    def __init__(self, table, max_age=None, age_column=None, max_rows=None, group_column=None):
+        self.table = table
+        self.max_age = max_age
+        self.age_column = age_column
+        self.max_rows = max_rows
+        self.group_column = group_column
+
+
+POLICIES = {
+    # entries are checked against this to avoid posting them twice, so keep
+    # them well beyond the age of anything still in a feed
+    'rss': Policy('rss', max_age=180 * DAY, age_column='posted_at', max_rows=1000, group_column='channel_id'),
+    # tokens that haven't refreshed successfully for a long time. those added
+    # before refreshes were timed are kept until they next refresh
+    'access_tokens': Policy('access_tokens', max_age=30 * DAY, age_column='refreshed_at'),
+}
+
+
+def policies_from_config(overrides):
+    """Returns :data:`POLICIES` with the ``max_age_days`` and ``max_rows``
+    given for each table in ``overrides`` applied. Either set to ``None``
+    turns that limit off."""
+    policies = dict(POLICIES)
+    for table, override in (overrides or {}).items():
+        policy = policies[table]
+        max_age = override.get('max_age_days', policy.max_age / DAY if policy.max_age else None)
+        policies[table] = Policy(
+            table, max_age * DAY if max_age else None, policy.age_column,
+            override.get('max_rows', policy.max_rows), policy.group_column
+        )
+    return policies
+
+
+class Retention:
+    """Deletes rows outside each table's :class:`Policy` in small
+    batches, then compacts the database, every ``interval`` minutes.
+
+    Parameters
+    ----------
+    policies: Mapping[str, Policy], optional
+        Policies by table.
+    interval: `float`, optional
+        Minutes between runs.
+    """
+
+    def __init__(self, policies=None, interval=INTERVAL):
+        self.policies = POLICIES if policies is None else policies
+        self.interval = interval
+        self.deleted = {table: 0 for table in self.policies}
+        self.last_run = None
+
+    async def _delete(self, table, select_sql, var):
+        deleted = 0
+        while True:
+            ids = await db.select_var(select_sql, (*var, BATCH_SIZE))
+            if not ids:
+                return deleted
+            await db.execute_many(f"DELETE FROM {table} WHERE id = ?", ids)
+            deleted += len(ids)
+            if len(ids) < BATCH_SIZE:
+                return deleted
+            await asyncio.sleep(BATCH_PAUSE)
+
+    async def prune(self, policy):
+        """Deletes the rows of ``policy.table`` outside ``policy``,
+        returning how many were deleted."""
+        deleted = 0
+        if policy.max_age:
+            deleted += await self._delete(
+                policy.table,
+                f"SELECT id FROM {policy.table} WHERE {policy.age_column} < ? LIMIT ?",
+                (time.time() - policy.max_age,)
+            )
+        if policy.max_rows:
+            deleted += await self._delete(
+                policy.table,
+                f"SELECT id FROM ("
+                f"SELECT id, ROW_NUMBER() OVER (PARTITION BY {policy.group_column} ORDER BY id DESC) AS newer "
+                f"FROM {policy.table}) AS ranked WHERE newer > ? LIMIT ?",
+                (policy.max_rows,)
+            )
+        return deleted
+
+    async def run_once(self):
+        for table, policy in self.policies.items():
+            deleted = await self.prune(policy)
+            self.deleted[table] += deleted
+            if deleted:
+                log.info(f'Retention - Deleted {deleted} rows from {table}')
+        free = await db.compact(VACUUM_PAGES)
+        if free is None and self.last_run is None:
+            log.info('Retention - Not compacting, run with --enable-incremental-vacuum to enable it')
+        elif free:
+            log.info(f'Retention - {free} free pages left to compact')
+        self.last_run = time.time()
+
+    async def run(self):
+        """Runs :meth:`run_once` every ``interval`` minutes until
+        cancelled."""
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                log.exception('Retention - Run failed')
+            await asyncio.sleep(self.interval * 60)
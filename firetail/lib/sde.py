@@ -0,0 +1,350 @@
+"""Local store of EVE static data, built from the Static Data Export.
+
+Systems, constellations, regions, celestials, stargates and types barely
+ever change, so rather than requesting them from ESI they can be served
+from a compact SQLite file built from Fuzzwork's CSV conversion of the
+SDE. Build or update the store with::
+
+    python -m firetail.lib.sde build [--source URL_OR_DIR] [--out PATH]
+
+``--source`` may be a local directory holding the ``.csv.bz2`` files,
+for building without network access.
+"""
+
+import argparse
+import bz2
+import csv
+import io
+import logging
+import os
+import sqlite3
+import urllib.request
+
+log = logging.getLogger(__name__)
+
+SDE_URL = "https://www.fuzzwork.co.uk/dump/latest"
+DEFAULT_PATH = 'firetail_sde.sqlite'
+
+# mapDenormalize group IDs
+STAR = 6
+PLANET = 7
+MOON = 8
+ASTEROID_BELT = 9
+STARGATE = 10
+STATION = 15
+
+CELESTIAL_GROUPS = {
+    STAR: 'star',
+    PLANET: 'planet',
+    MOON: 'moon',
+    ASTEROID_BELT: 'asteroid',
+    STARGATE: 'stargate',
+    STATION: 'station',
+}
+
+# ID ranges of the static data held, with how to find their names
+NAME_LOOKUPS = (
+    ((0, 500000), "SELECT name FROM types WHERE type_id = ?", 'inventory_type'),
+    ((10000000, 11000000), "SELECT name FROM regions WHERE region_id = ?", 'region'),
+    ((20000000, 21000000), "SELECT name FROM constellations WHERE constellation_id = ?", 'constellation'),
+    ((30000000, 33000000), "SELECT name FROM systems WHERE system_id = ?", 'solar_system'),
+    ((60000000, 64000000), "SELECT name FROM celestials WHERE celestial_id = ?", 'station'),
+)
+
+# names of the static data held for each ESI search category
+SEARCH_LOOKUPS = {
+    'solar_system': "SELECT system_id, name FROM systems",
+    'constellation': "SELECT constellation_id, name FROM constellations",
+    'region': "SELECT region_id, name FROM regions",
+    'inventory_type': "SELECT type_id, name FROM types WHERE published = 1",
+}
+
+SCHEMA = """
+CREATE TABLE regions (
+    region_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE constellations (
+    constellation_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    region_id INTEGER NOT NULL
+);
+CREATE TABLE systems (
+    system_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    constellation_id INTEGER NOT NULL,
+    security_status REAL NOT NULL
+);
+CREATE TABLE celestials (
+    celestial_id INTEGER PRIMARY KEY,
+    group_id INTEGER NOT NULL,
+    system_id INTEGER NOT NULL,
+    orbit_id INTEGER,
+    name TEXT NOT NULL
+);
+CREATE TABLE stargates (
+    stargate_id INTEGER PRIMARY KEY,
+    destination_id INTEGER NOT NULL
+);
+CREATE TABLE types (
+    type_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    group_id INTEGER NOT NULL,
+    published INTEGER NOT NULL
+);
+CREATE TABLE groups (
+    group_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    category_id INTEGER NOT NULL
+);
+CREATE INDEX constellations_region ON constellations (region_id);
+CREATE INDEX systems_constellation ON systems (constellation_id);
+CREATE INDEX celestials_system ON celestials (system_id);
+"""
+
+
+def _null(value):
+    return None if value in ('', 'None', 'NULL') else value
+
+
+def _read_csv(source, name):
+    """Yields each row of an SDE table as a dict."""
+    filename = f'{name}.csv.bz2'
+    if os.path.isdir(source):
+        raw = open(os.path.join(source, filename), 'rb')
+    else:
+        log.info(f'Downloading {filename}')
+        raw = io.BytesIO(urllib.request.urlopen(f'{source}/{filename}').read())
+    with bz2.open(raw, 'rt', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            yield {k: _null(v) for k, v in row.items()}
+
+
+def build(path=DEFAULT_PATH, source=SDE_URL):
+    """Builds the static data store at ``path`` from the SDE.
+
+    The store is written to a temporary file and moved into place once
+    complete, so a running bot never sees a partial store.
+    """
+    tmp_path = f'{path}.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    db = sqlite3.connect(tmp_path)
+    try:
+        db.executescript(SCHEMA)
+        db.executemany(
+            "INSERT INTO regions VALUES (?, ?)",
+            ((r['regionID'], r['regionName']) for r in _read_csv(source, 'mapRegions'))
+        )
+        db.executemany(
+            "INSERT INTO constellations VALUES (?, ?, ?)",
+            ((r['constellationID'], r['constellationName'], r['regionID'])
+             for r in _read_csv(source, 'mapConstellations'))
+        )
+        db.executemany(
+            "INSERT INTO systems VALUES (?, ?, ?, ?)",
+            ((r['solarSystemID'], r['solarSystemName'], r['constellationID'], r['security'])
+             for r in _read_csv(source, 'mapSolarSystems'))
+        )
+        db.executemany(
+            "INSERT INTO celestials VALUES (?, ?, ?, ?, ?)",
+            ((r['itemID'], r['groupID'], r['solarSystemID'], r['orbitID'], r['itemName'])
+             for r in _read_csv(source, 'mapDenormalize')
+             if r['solarSystemID'] and int(r['groupID']) in CELESTIAL_GROUPS)
+        )
+        db.executemany(
+            "INSERT INTO stargates VALUES (?, ?)",
+            ((r['stargateID'], r['destinationID']) for r in _read_csv(source, 'mapJumps'))
+        )
+        db.executemany(
+            "INSERT INTO types VALUES (?, ?, ?, ?)",
+            ((r['typeID'], r['typeName'], r['groupID'], r['published'] or 0)
+             for r in _read_csv(source, 'invTypes') if r['typeName'])
+        )
+        db.executemany(
+            "INSERT INTO groups VALUES (?, ?, ?)",
+            ((r['groupID'], r['groupName'], r['categoryID']) for r in _read_csv(source, 'invGroups'))
+        )
+        db.commit()
+        db.execute("VACUUM")
+    finally:
+        db.close()
+    os.replace(tmp_path, path)
+
+
+class StaticStore:
+    """Read-only access to a static data store built by :func:`build`.
+
+    Lookups return dicts shaped like the matching ESI responses, limited
+    to the fields the SDE provides, or `None` if the ID isn't present.
+
+    Parameters
+    ----------
+    path: `str`
+        Path of the store's SQLite file.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+
+    @classmethod
+    def open(cls, path=DEFAULT_PATH):
+        """Opens the store at ``path``, or returns `None` if it hasn't
+        been built."""
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except sqlite3.Error as e:
+            log.exception(f'Unable to open static data store {path}', exc_info=e)
+            return None
+
+    def close(self):
+        self._db.close()
+
+    def _one(self, sql, var):
+        return self._db.execute(sql, var).fetchone()
+
+    def system(self, system_id):
+        row = self._one(
+            "SELECT name, constellation_id, security_status FROM systems WHERE system_id = ?", (system_id,)
+        )
+        if not row:
+            return None
+        name, constellation_id, security_status = row
+        data = {
+            'system_id': system_id,
+            'name': name,
+            'constellation_id': constellation_id,
+            'security_status': security_status,
+            'planets': [],
+            'stargates': [],
+            'stations': [],
+        }
+        planets = {}
+        orbiting = []
+        celestials = self._db.execute(
+            "SELECT celestial_id, group_id, orbit_id FROM celestials WHERE system_id = ? ORDER BY celestial_id",
+            (system_id,)
+        )
+        for celestial_id, group_id, orbit_id in celestials:
+            if group_id == STAR:
+                data['star_id'] = celestial_id
+            elif group_id == PLANET:
+                planets[celestial_id] = {'planet_id': celestial_id, 'moons': [], 'asteroid_belts': []}
+                data['planets'].append(planets[celestial_id])
+            elif group_id == STARGATE:
+                data['stargates'].append(celestial_id)
+            elif group_id == STATION:
+                data['stations'].append(celestial_id)
+            else:
+                orbiting.append((celestial_id, group_id, orbit_id))
+        for celestial_id, group_id, orbit_id in orbiting:
+            planet = planets.get(orbit_id)
+            if planet:
+                key = 'moons' if group_id == MOON else 'asteroid_belts'
+                planet[key].append(celestial_id)
+        if not data['stargates']:
+            del data['stargates']
+        if not data['stations']:
+            del data['stations']
+        return data
+
+    def constellation(self, constellation_id):
+        row = self._one("SELECT name, region_id FROM constellations WHERE constellation_id = ?", (constellation_id,))
+        if not row:
+            return None
+        systems = self._db.execute(
+            "SELECT system_id FROM systems WHERE constellation_id = ? ORDER BY system_id", (constellation_id,)
+        )
+        return {
+            'constellation_id': constellation_id,
+            'name': row[0],
+            'region_id': row[1],
+            'systems': [s for s, in systems],
+        }
+
+    def region(self, region_id):
+        row = self._one("SELECT name FROM regions WHERE region_id = ?", (region_id,))
+        if not row:
+            return None
+        constellations = self._db.execute(
+            "SELECT constellation_id FROM constellations WHERE region_id = ? ORDER BY constellation_id", (region_id,)
+        )
+        return {
+            'region_id': region_id,
+            'name': row[0],
+            'constellations': [c for c, in constellations],
+        }
+
+    def celestial(self, celestial_id):
+        """Returns the name, system and kind of a star, planet, moon,
+        asteroid belt, stargate or station."""
+        row = self._one("SELECT group_id, system_id, name FROM celestials WHERE celestial_id = ?", (celestial_id,))
+        if not row:
+            return None
+        group_id, system_id, name = row
+        return {'name': name, 'system_id': system_id, 'type': CELESTIAL_GROUPS[group_id]}
+
+    def stargate(self, stargate_id):
+        row = self._one(
+            "SELECT c.name, c.system_id, d.celestial_id, d.system_id FROM stargates s "
+            "JOIN celestials c ON c.celestial_id = s.stargate_id "
+            "JOIN celestials d ON d.celestial_id = s.destination_id "
+            "WHERE s.stargate_id = ?",
+            (stargate_id,)
+        )
+        if not row:
+            return None
+        name, system_id, destination_id, destination_system_id = row
+        return {
+            'stargate_id': stargate_id,
+            'name': name,
+            'system_id': system_id,
+            'destination': {'stargate_id': destination_id, 'system_id': destination_system_id},
+        }
+
+    def name(self, id_):
+        """Returns ``/universe/names/`` style info for a static ID, or
+        `None` if it isn't static data held by the store."""
+        for (start, end), sql, category in NAME_LOOKUPS:
+            if start <= id_ < end:
+                row = self._one(sql, (id_,))
+                if row:
+                    return {'id': id_, 'name': row[0], 'category': category}
+                return None
+        return None
+
+    def names(self, category):
+        """Returns ``(id, name)`` for everything in an ESI search
+        category, or `None` if the store doesn't hold it."""
+        sql = SEARCH_LOOKUPS.get(category)
+        if sql is None:
+            return None
+        return self._db.execute(sql).fetchall()
+
+    def type(self, type_id):
+        row = self._one("SELECT name, group_id, published FROM types WHERE type_id = ?", (type_id,))
+        if not row:
+            return None
+        name, group_id, published = row
+        return {'type_id': type_id, 'name': name, 'group_id': group_id, 'published': bool(published)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage Firetail's static data store.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build_parser = sub.add_parser('build', help='Build the store from the SDE.')
+    build_parser.add_argument('--source', default=SDE_URL, help='SDE CSV base URL or local directory.')
+    build_parser.add_argument('--out', default=DEFAULT_PATH, help='Path of the store to write.')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'build':
+        build(args.out, args.source)
+        log.info(f'Static data store written to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+from bisect import bisect_left
+
+# search categories the static data store can answer
+STATIC_CATEGORIES = ('solar_system', 'constellation', 'region', 'inventory_type')
+
+
+def normalise(term):
+    """Case-folds ``term`` and collapses its whitespace, so equivalent
+    searches share cache entries."""
+    return ' '.join(term.split()).casefold()
+
+
+class PrefixIndex:
+    """Case-insensitive exact and prefix name lookups over a fixed set of
+    names, held as a sorted list searched by bisection.
+
+    Parameters
+    ----------
+    entries: Iterable[Tuple[int, str]]
+        The ID and name of each entry.
+    """
+
+    def __init__(self, entries):
+        pairs = sorted((normalise(name), id_) for id_, name in entries)
+        self._names = [name for name, _ in pairs]
+        self._ids = [id_ for _, id_ in pairs]
+
+    def __len__(self):
+        return len(self._names)
+
+    def exact(self, term):
+        """Returns the IDs of entries named ``term``."""
+        term = normalise(term)
+        start = bisect_left(self._names, term)
+        end = start
+        while end < len(self._names) and self._names[end] == term:
+            end += 1
+        return self._ids[start:end]
+
+    def prefix(self, term):
+        """Returns the IDs of entries with names starting with ``term``."""
+        term = normalise(term)
+        if not term:
+            return []
+        start = bisect_left(self._names, term)
+        end = start
+        while end < len(self._names) and self._names[end].startswith(term):
+            end += 1
+        return self._ids[start:end]
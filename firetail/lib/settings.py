@@ -0,0 +1,61 @@
+import logging
+
+from . import db
+
+log = logging.getLogger(__name__)
+
+
+class Settings:
+    """In-memory copy of the small per-guild and per-channel tables read
+    by every command, so checks don't wait on the database.
+
+    The tables are read once by :meth:`load`. RPG channels must be changed
+    through the methods here, which update the database and the copy
+    together. The bot has no commands that change prefixes or the
+    whitelist, so edits made to those tables directly are only seen once
+    :meth:`load` is called again.
+
+    Attributes
+    ----------
+    prefixes: Dict[int, str]
+        Command prefix by guild ID.
+    whitelist: Dict[int, Set[int]]
+        IDs of the roles allowed to use commands, by channel ID.
+    rpg_channels: Dict[int, int]
+        RPG channel ID by guild ID.
+    """
+
+    def __init__(self):
+        # updated in place, so references held elsewhere stay current
+        self.prefixes = {}
+        self.whitelist = {}
+        self.rpg_channels = {}
+
+    async def load(self):
+        prefixes = await db.select("SELECT guild_id, prefix FROM prefixes")
+        whitelist = await db.select("SELECT location_id, role_id FROM whitelist")
+        rpg_channels = await db.select("SELECT server_id, channel_id FROM eve_rpg_channels")
+        self.prefixes.clear()
+        self.prefixes.update(prefixes)
+        self.whitelist.clear()
+        for location_id, role_id in whitelist:
+            self.whitelist.setdefault(location_id, set()).add(role_id)
+        self.rpg_channels.clear()
+        self.rpg_channels.update((server_id, int(channel_id)) for server_id, channel_id in rpg_channels)
+        log.info(
+            f'Loaded settings: {len(self.prefixes)} prefixes, {len(self.whitelist)} whitelisted channels, '
+            f'{len(self.rpg_channels)} RPG channels'
+        )
+
+    async def set_rpg_channel(self, server_id, channel_id, owner_id):
+        await db.execute_sql(
+            "REPLACE INTO eve_rpg_channels (server_id, channel_id, owner_id) VALUES (?, ?, ?)",
+            (server_id, channel_id, owner_id)
+        )
+        self.rpg_channels[server_id] = channel_id
+
+    async def remove_rpg_channel(self, channel_id):
+        await db.execute_sql("DELETE FROM eve_rpg_channels WHERE channel_id = ?", (channel_id,))
+        for server_id, rpg_channel_id in list(self.rpg_channels.items()):
+            if rpg_channel_id == int(channel_id):
+                del self.rpg_channels[server_id]
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+# how long to wait before retrying a dataset that failed to download
+RETRY_DELAY = 60
+
+
+class Snapshot:
+    """A universe-wide ESI dataset indexed by solar system ID.
+
+    The dataset is downloaded at most once per expiry window, as given by
+    the response headers, and all point lookups in between are answered
+    from the index. If a refresh fails, the previous index keeps being
+    used until a retry succeeds.
+
+    Parameters
+    ----------
+    esi: `ESI`
+        The ESI data manager used to make requests.
+    url: `str`
+        URL of the dataset.
+    key: `str`, optional
+        Field of each row holding the system ID. Default is
+        ``'system_id'``.
+    multi: `bool`, optional
+        Whether a system can have more than one row, in which case each
+        system maps to a list of rows. Default is `False`.
+    """
+
+    def __init__(self, esi, url, key='system_id', multi=False):
+        self._esi = esi
+        self.url = url
+        self.key = key
+        self.multi = multi
+        self.rows = []
+        self._index = {}
+        self._expires = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self._expires
+
+    async def refresh(self, force=False):
+        """Downloads and re-indexes the dataset if it has expired."""
+        async with self._lock:
+            # another caller may have refreshed while we waited
+            if not (force or self.expired):
+                return
+            data, ttl = await self._esi._get(self.url, conditional=True)
+            if not isinstance(data, list) or ttl is None:
+                self._expires = time.monotonic() + RETRY_DELAY
+                return
+
+            index = {}
+            for row in data:
+                system_id = row.get(self.key)
+                if self.multi:
+                    index.setdefault(system_id, []).append(row)
+                else:
+                    index[system_id] = row
+            self.rows = data
+            self._index = index
+            self._expires = time.monotonic() + ttl
+
+    async def all(self):
+        """Returns every row of the dataset."""
+        if self.expired:
+            await self.refresh()
+        return self.rows
+
+    async def get(self, system_id, default=None):
+        """Returns the row for ``system_id``, or the list of rows if
+        ``multi``. Returns ``default`` if the system isn't present."""
+        if self.expired:
+            await self.refresh()
+        return self._index.get(system_id, default)
@@ -0,0 +1,12 @@
+-- killmail channel removal
+CREATE INDEX IF NOT EXISTS add_kills_channelid ON add_kills (channelid);
+-- checking whether an entry has been posted
+CREATE INDEX IF NOT EXISTS rss_entry_id ON rss (entry_id);
+-- score updates and removal of ended fights
+CREATE INDEX IF NOT EXISTS sov_tracker_system_fight ON sov_tracker (system_id, fight_type);
+CREATE INDEX IF NOT EXISTS whitelist_location_id ON whitelist (location_id);
+-- removal of tokens that fail to refresh
+CREATE INDEX IF NOT EXISTS access_tokens_refresh_token ON access_tokens (refresh_token);
+-- leaderboards
+CREATE INDEX IF NOT EXISTS eve_rpg_players_level ON eve_rpg_players (level);
+CREATE INDEX IF NOT EXISTS eve_rpg_players_kills ON eve_rpg_players (kills);
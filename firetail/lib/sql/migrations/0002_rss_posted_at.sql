@@ -0,0 +1,6 @@
+-- when each entry was posted, so old entries can be pruned. entries posted
+-- before this are left NULL, and pruned only by the per-channel row limit
+ALTER TABLE rss ADD COLUMN posted_at DOUBLE PRECISION DEFAULT NULL;
+-- finding the oldest entries of each channel
+CREATE INDEX IF NOT EXISTS rss_channel_id ON rss (channel_id, id);
+CREATE INDEX IF NOT EXISTS rss_posted_at ON rss (posted_at);
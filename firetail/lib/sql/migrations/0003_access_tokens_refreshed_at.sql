@@ -0,0 +1,4 @@
+-- when each token was last refreshed, so tokens that stop refreshing can be
+-- pruned. tokens added before this are left NULL until their next refresh
+ALTER TABLE access_tokens ADD COLUMN refreshed_at DOUBLE PRECISION DEFAULT NULL;
+CREATE INDEX IF NOT EXISTS access_tokens_refreshed_at ON access_tokens (refreshed_at);
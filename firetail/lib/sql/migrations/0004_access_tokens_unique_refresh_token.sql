@@ -0,0 +1,5 @@
+-- one row per refresh token, so adding a token again replaces it. keep the
+-- newest of any duplicates added before this
+DELETE FROM access_tokens WHERE id NOT IN (SELECT MAX(id) FROM access_tokens GROUP BY refresh_token);
+DROP INDEX IF EXISTS access_tokens_refresh_token;
+CREATE UNIQUE INDEX IF NOT EXISTS access_tokens_refresh_token_unique ON access_tokens (refresh_token);
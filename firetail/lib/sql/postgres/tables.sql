@@ -0,0 +1,71 @@
+CREATE TABLE IF NOT EXISTS firetail (
+    id BIGSERIAL PRIMARY KEY,
+    entry TEXT NOT NULL UNIQUE,
+    value TEXT NOT NULL,
+    additional_value TEXT DEFAULT NULL
+);
+CREATE TABLE IF NOT EXISTS whitelist (
+    id BIGSERIAL PRIMARY KEY,
+    location_id BIGINT,
+    role_id BIGINT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS add_kills (
+    id BIGSERIAL PRIMARY KEY,
+    channelid BIGINT NOT NULL,
+    serverid BIGINT NOT NULL,
+    groupid BIGINT NOT NULL,
+    ownerid BIGINT NOT NULL,
+    losses TEXT NOT NULL,
+    threshold BIGINT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sov_tracker (
+    id BIGSERIAL PRIMARY KEY,
+    channel_id BIGINT NOT NULL,
+    fight_type TEXT NOT NULL,
+    system_id BIGINT NOT NULL,
+    defender_score DOUBLE PRECISION NOT NULL,
+    attackers_score DOUBLE PRECISION NOT NULL
+);
+CREATE TABLE IF NOT EXISTS eve_rpg_channels (
+    id BIGSERIAL PRIMARY KEY,
+    server_id BIGINT NOT NULL UNIQUE,
+    channel_id BIGINT NOT NULL,
+    owner_id BIGINT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS eve_rpg_players (
+    id BIGSERIAL PRIMARY KEY,
+    server_id BIGINT NOT NULL,
+    player_id BIGINT NOT NULL UNIQUE,
+    kills BIGINT DEFAULT 0,
+    losses BIGINT DEFAULT 0,
+    level BIGINT DEFAULT 0,
+    xp BIGINT DEFAULT 0,
+    ship TEXT DEFAULT NULL,
+    item TEXT DEFAULT NULL
+);
+CREATE TABLE IF NOT EXISTS access_tokens (
+    id BIGSERIAL PRIMARY KEY,
+    character_id BIGINT NOT NULL,
+    discord_id BIGINT NOT NULL,
+    refresh_token TEXT NOT NULL,
+    access_token TEXT DEFAULT NULL,
+    expires DOUBLE PRECISION DEFAULT NULL
+);
+CREATE TABLE IF NOT EXISTS rss (
+    id BIGSERIAL PRIMARY KEY,
+    entry_id TEXT NOT NULL,
+    channel_id BIGINT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rss_channels (
+    id BIGSERIAL PRIMARY KEY,
+    rss_feed BIGINT NOT NULL,
+    channel_id BIGINT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS prefixes (
+    guild_id BIGINT PRIMARY KEY,
+    prefix TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    applied_at DOUBLE PRECISION NOT NULL
+);
@@ -0,0 +1,91 @@
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# how long resolved addresses are reused, in seconds
+DNS_CACHE_TTL = 300
+# how long idle connections are kept open for reuse, in seconds
+KEEPALIVE_TIMEOUT = 60
+
+# connection pool and timeout settings for each upstream
+UPSTREAMS = {
+    'esi': {
+        'hosts': ('esi.evetech.net', 'login.eveonline.com'),
+        'limit_per_host': 20,
+        'timeout': aiohttp.ClientTimeout(total=60, connect=10, sock_read=30),
+        'headers': {'Accept': 'application/json'},
+    },
+    'zkill': {
+        'hosts': ('zkillboard.com',),
+        # zKillboard rate limits aggressively, so keep the pool small
+        'limit_per_host': 4,
+        'timeout': aiohttp.ClientTimeout(total=90, connect=10, sock_read=60),
+        'headers': {'Accept': 'application/json'},
+    },
+    'fuzzwork': {
+        'hosts': ('www.fuzzwork.co.uk', 'market.fuzzwork.co.uk'),
+        'limit_per_host': 4,
+        'timeout': aiohttp.ClientTimeout(total=60, connect=10, sock_read=30),
+        'headers': {'Accept': 'application/json'},
+    },
+    'rss': {
+        'hosts': (),
+        'limit_per_host': 4,
+        'timeout': aiohttp.ClientTimeout(total=60, connect=10, sock_read=30),
+        'headers': {},
+    },
+    'default': {
+        'hosts': (),
+        'limit_per_host': 10,
+        'timeout': aiohttp.ClientTimeout(total=60, connect=10, sock_read=30),
+        'headers': {},
+    },
+}
+
+
+class Transport:
+    """Owns a pooled HTTP session for each upstream the bot talks to.
+
+    Each session has its own connector, so a slow upstream can't use up
+    the connections of another, and keeps connections alive with a DNS
+    cache and gzip/deflate compression. Sessions are available as
+    attributes named after the upstream, such as ``transport.zkill``.
+
+    Parameters
+    ----------
+    overrides: Mapping[str, Mapping[str, Any]], optional
+        Settings to change for each upstream, such as
+        ``{'esi': {'limit_per_host': 40}}``.
+    """
+
+    def __init__(self, overrides=None):
+        self._sessions = {}
+        self._hosts = {}
+        for name, settings in UPSTREAMS.items():
+            settings = {**settings, **(overrides or {}).get(name, {})}
+            connector = aiohttp.TCPConnector(
+                limit_per_host=settings['limit_per_host'],
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._sessions[name] = aiohttp.ClientSession(
+                connector=connector,
+                timeout=settings['timeout'],
+                headers={'Accept-Encoding': 'gzip, deflate', **settings['headers']},
+            )
+            for host in settings['hosts']:
+                self._hosts[host] = name
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['_sessions'][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def for_url(self, url):
+        """Returns the session for the upstream serving ``url``."""
+        return self._sessions[self._hosts.get(urlsplit(url).hostname, 'default')]
+
+    async def close(self):
+        for session in self._sessions.values():
+            await session.close()
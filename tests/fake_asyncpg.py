@@ -0,0 +1,97 @@
+"""Stand-in for the parts of asyncpg used by
+:class:`firetail.lib.postgres.PostgresStorage`, running statements on an
+in-memory sqlite database.
+
+Statements arrive already translated for PostgreSQL. Those sqlite can't
+run are rewritten: ``$n`` placeholders become ``?n``, ``BIGSERIAL`` ids
+become rowid aliases, ``SET column = DEFAULT`` uses the column's default,
+and the information schema is read from ``pragma_table_info``. Enough to
+round-trip the bot's own statements, not to check PostgreSQL syntax.
+"""
+
+import re
+import sqlite3
+from contextlib import asynccontextmanager
+
+_PLACEHOLDER = re.compile(r'\$(\d+)')
+_SET_DEFAULT = re.compile(r'(\w+) = DEFAULT')
+_INSERT = re.compile(r'^\s*INSERT\s+INTO\s+(\w+)', re.IGNORECASE)
+_COLUMNS = 'SELECT table_name, column_name FROM information_schema.columns'
+
+
+class Connection:
+
+    def __init__(self, db):
+        self._db = db
+
+    def _rewrite(self, sql):
+        sql = _PLACEHOLDER.sub(r'?\1', sql).replace('BIGSERIAL PRIMARY KEY', 'INTEGER PRIMARY KEY')
+        if sql.startswith(_COLUMNS):
+            return (
+                "SELECT m.name, c.name FROM sqlite_master AS m, pragma_table_info(m.name) AS c "
+                "WHERE m.type = 'table' ORDER BY c.cid"
+            )
+        insert = _INSERT.match(sql)
+        if insert:
+            defaults = {row[1]: row[4] for row in self._db.execute(f'PRAGMA table_info({insert.group(1)})')}
+            sql = _SET_DEFAULT.sub(lambda m: f'{m.group(1)} = {defaults.get(m.group(1)) or "NULL"}', sql)
+        return sql
+
+    async def execute(self, sql, *args):
+        if args:
+            self._db.execute(self._rewrite(sql), args)
+        else:
+            self._db.executescript(self._rewrite(sql))
+
+    async def executemany(self, sql, rows):
+        self._db.executemany(self._rewrite(sql), rows)
+
+    async def fetch(self, sql, *args):
+        return self._db.execute(self._rewrite(sql), args).fetchall()
+
+    async def fetchrow(self, sql, *args):
+        return self._db.execute(self._rewrite(sql), args).fetchone()
+
+    async def fetchval(self, sql, *args):
+        row = await self.fetchrow(sql, *args)
+        return row[0] if row else None
+
+    @asynccontextmanager
+    async def transaction(self):
+        self._db.execute('BEGIN')
+        try:
+            yield
+        except BaseException:
+            if self._db.in_transaction:
+                self._db.execute('ROLLBACK')
+            raise
+        # scripts commit any open transaction before running
+        if self._db.in_transaction:
+            self._db.execute('COMMIT')
+
+
+class Pool:
+    """A pool of one connection, which is all sqlite's single writer
+    allows anyway."""
+
+    def __init__(self):
+        self.db = sqlite3.connect(':memory:', isolation_level=None)
+        self.db.create_function('pg_advisory_xact_lock', 1, lambda key: None)
+        self.db.create_function('current_schema', 0, lambda: 'public')
+        self.acquired = 0
+        self.closed = False
+
+    async def acquire(self):
+        self.acquired += 1
+        return Connection(self.db)
+
+    async def release(self, conn):
+        self.acquired -= 1
+
+    async def close(self):
+        self.closed = True
+        self.db.close()
+
+
+async def create_pool(url, min_size=1, max_size=10):
+    return Pool()
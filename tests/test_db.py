@@ -0,0 +1,138 @@
+import asyncio
+import os
+import sqlite3
+
+import fake_asyncpg
+import pytest
+
+from firetail.lib import db, postgres
+
+
+@pytest.fixture(params=['sqlite', 'postgres'])
+def database(request, tmp_path, monkeypatch):
+    """Returns a function running a coroutine function with the database
+    open on each backend, PostgreSQL being a sqlite backed stand-in."""
+    path = str(tmp_path / 'firetail.sqlite')
+    url = None
+    if request.param == 'postgres':
+        monkeypatch.setattr(postgres, 'asyncpg', fake_asyncpg)
+        url = 'postgresql://localhost/firetail'
+
+    def run(test):
+        async def main():
+            await db.open_db(path, url=url)
+            try:
+                await db.create_tables()
+                await test()
+            finally:
+                await db.close_db()
+
+        asyncio.run(main())
+
+    return run
+
+
+def test_create_tables_applies_migrations(database):
+    async def test():
+        versions = await db.select_var("SELECT version FROM schema_version ORDER BY version", ())
+        assert versions == [(version,) for version, _ in db.migrations()]
+        # a second start finds nothing left to apply
+        await db.create_tables()
+        assert await db.select("SELECT COUNT(*) FROM schema_version", single=True) == len(versions)
+
+    database(test)
+
+
+def test_insert_and_read_back(database):
+    async def test():
+        first = await db.execute_sql("INSERT INTO whitelist (location_id, role_id) VALUES (?, ?)", (10, 100))
+        second = await db.execute_sql("INSERT INTO whitelist (location_id, role_id) VALUES (?, ?)", (10, 101))
+        assert second == first + 1
+        await db.execute_many("INSERT INTO whitelist (location_id, role_id) VALUES (?, ?)", [(20, 200), (30, 300)])
+        rows = await db.select_var("SELECT location_id, role_id FROM whitelist WHERE location_id = ?", (10,))
+        assert rows == [(10, 100), (10, 101)]
+        assert await db.select("SELECT COUNT(*) FROM whitelist", single=True) == 4
+
+    database(test)
+
+
+def test_queued_writes_committed_in_order(database):
+    async def test():
+        db.queue_write("INSERT INTO prefixes (guild_id, prefix) VALUES (?, ?)", (1, '!'))
+        db.queue_write("UPDATE prefixes SET prefix = ? WHERE guild_id = ?", ('?', 1))
+        await db.flush()
+        assert await db.select("SELECT guild_id, prefix FROM prefixes") == [(1, '?')]
+
+    database(test)
+
+
+def test_replace_into_upserts(database):
+    async def test():
+        sql = "REPLACE INTO prefixes (guild_id, prefix) VALUES (?, ?)"
+        await db.execute_sql(sql, (1, '!'))
+        await db.execute_sql(sql, (1, '?'))
+        await db.execute_sql(sql, (2, '.'))
+        assert await db.select("SELECT guild_id, prefix FROM prefixes ORDER BY guild_id") == [(1, '?'), (2, '.')]
+
+    database(test)
+
+
+def test_replace_into_access_tokens_dedupes(database):
+    async def test():
+        sql = ''' REPLACE INTO access_tokens(character_id,discord_id,refresh_token,access_token,expires,refreshed_at)
+                  VALUES(?,?,?,?,?,?) '''
+        await db.execute_sql(sql, (1, 10, 'refresh', 'old', 1.0, 1.0))
+        await db.execute_sql(sql, (1, 10, 'refresh', 'new', 2.0, 2.0))
+        await db.execute_many(
+            "UPDATE access_tokens SET access_token = ?, expires = ?, refreshed_at = ? WHERE refresh_token = ?",
+            [('newer', 3.0, 3.0, 'refresh')]
+        )
+        rows = await db.select("SELECT refresh_token, access_token, expires FROM access_tokens")
+        assert rows == [('refresh', 'newer', 3.0)]
+
+    database(test)
+
+
+def test_unique_refresh_token_migration_keeps_newest(tmp_path):
+    path = str(tmp_path / 'firetail.sqlite')
+    with open(os.path.join(db.HERE, 'sql', 'tables.sql'), 'r') as f:
+        tables = f.read()
+    conn = sqlite3.connect(path)
+    conn.executescript(tables)
+    conn.executemany(
+        "INSERT INTO access_tokens (character_id, discord_id, refresh_token, access_token) VALUES (?, ?, ?, ?)",
+        [(1, 10, 'refresh', 'old'), (1, 10, 'refresh', 'new'), (2, 20, 'other', 'only')]
+    )
+    conn.commit()
+    conn.close()
+
+    async def main():
+        await db.open_db(path)
+        try:
+            await db.create_tables()
+            return await db.select("SELECT refresh_token, access_token FROM access_tokens ORDER BY refresh_token")
+        finally:
+            await db.close_db()
+
+    assert asyncio.run(main()) == [('other', 'only'), ('refresh', 'new')]
+
+
+def test_compact_only_when_incremental(tmp_path):
+    old = str(tmp_path / 'old.sqlite')
+    conn = sqlite3.connect(old)
+    conn.execute("CREATE TABLE earlier (id INTEGER PRIMARY KEY)")
+    conn.close()
+
+    async def compact(path):
+        await db.open_db(path)
+        try:
+            await db.create_tables()
+            return await db.compact(100)
+        finally:
+            await db.close_db()
+
+    assert asyncio.run(compact(str(tmp_path / 'new.sqlite'))) == 0
+    assert asyncio.run(compact(old)) is None
+    assert db.enable_incremental_vacuum(old)
+    assert not db.enable_incremental_vacuum(old)
+    assert asyncio.run(compact(old)) == 0
@@ -0,0 +1,85 @@
+import pytest
+
+from firetail.lib.postgres import PostgresStorage, _placeholders
+
+COLUMNS = {
+    'access_tokens': ['id', 'character_id', 'discord_id', 'refresh_token', 'access_token', 'expires'],
+    'prefixes': ['guild_id', 'prefix'],
+    'rss': ['id', 'entry_id', 'channel_id', 'posted_at'],
+    'whitelist': ['id', 'location_id', 'role_id'],
+}
+
+
+@pytest.fixture
+def storage():
+    storage = PostgresStorage(None)
+    storage.columns = COLUMNS
+    return storage
+
+
+def test_placeholders_numbered_in_order():
+    assert _placeholders("SELECT * FROM rss WHERE entry_id = ? AND channel_id = ?") == (
+        "SELECT * FROM rss WHERE entry_id = $1 AND channel_id = $2"
+    )
+
+
+def test_placeholders_skip_string_literals():
+    assert _placeholders("SELECT * FROM firetail WHERE entry = 'what?' AND value = ?") == (
+        "SELECT * FROM firetail WHERE entry = 'what?' AND value = $1"
+    )
+    assert _placeholders("SELECT * FROM firetail WHERE entry = 'it''s ?' AND value = ?") == (
+        "SELECT * FROM firetail WHERE entry = 'it''s ?' AND value = $1"
+    )
+
+
+def test_placeholders_convert_backticks():
+    assert _placeholders("SELECT `value` FROM firetail WHERE entry = '`'") == (
+        "SELECT \"value\" FROM firetail WHERE entry = '`'"
+    )
+
+
+def test_replace_becomes_upsert(storage):
+    sql = storage._translate_uncached("REPLACE INTO prefixes (guild_id, prefix) VALUES (?, ?)", False)
+    assert sql == (
+        "INSERT INTO prefixes (guild_id, prefix) VALUES ($1, $2) "
+        "ON CONFLICT (guild_id) DO UPDATE SET prefix = EXCLUDED.prefix"
+    )
+
+
+def test_replace_resets_columns_not_given(storage):
+    sql = storage._translate_uncached(
+        "REPLACE INTO access_tokens(refresh_token,access_token) VALUES(?,?)", False
+    )
+    assert sql == (
+        "INSERT INTO access_tokens(refresh_token,access_token) VALUES($1,$2) "
+        "ON CONFLICT (refresh_token) DO UPDATE SET access_token = EXCLUDED.access_token, "
+        "character_id = DEFAULT, discord_id = DEFAULT, expires = DEFAULT"
+    )
+
+
+def test_replace_without_key_is_insert(storage):
+    sql = storage._translate_uncached("REPLACE INTO rss(entry_id,channel_id,posted_at) VALUES(?,?,?)", False)
+    assert sql == "INSERT INTO rss(entry_id,channel_id,posted_at) VALUES($1,$2,$3)"
+
+
+def test_insert_returns_id(storage):
+    sql = "INSERT INTO whitelist (location_id, role_id) VALUES (?, ?)"
+    assert storage._translate_uncached(sql, True) == (
+        "INSERT INTO whitelist (location_id, role_id) VALUES ($1, $2) RETURNING id"
+    )
+    assert storage._translate_uncached(sql, False) == "INSERT INTO whitelist (location_id, role_id) VALUES ($1, $2)"
+
+
+def test_upsert_returns_id(storage):
+    sql = storage._translate_uncached(
+        "REPLACE INTO access_tokens(character_id,discord_id,refresh_token,access_token,expires) VALUES(?,?,?,?,?);",
+        True
+    )
+    assert sql.startswith("INSERT INTO access_tokens(")
+    assert "ON CONFLICT (refresh_token) DO UPDATE SET" in sql
+    assert sql.endswith("expires = EXCLUDED.expires RETURNING id")
+
+
+def test_no_id_column_no_returning(storage):
+    sql = storage._translate_uncached("REPLACE INTO prefixes (guild_id, prefix) VALUES (?, ?)", True)
+    assert not sql.endswith("RETURNING id")
@@ -0,0 +1,48 @@
+import asyncio
+
+from firetail.lib import db
+from firetail.lib.settings import Settings
+
+
+def run(tmp_path, test):
+    async def main():
+        await db.open_db(str(tmp_path / 'firetail.sqlite'))
+        try:
+            await db.create_tables()
+            await test()
+        finally:
+            await db.close_db()
+
+    asyncio.run(main())
+
+
+def test_rpg_channel_changes_seen_without_reload(tmp_path):
+    async def test():
+        settings = Settings()
+        await settings.load()
+        await settings.set_rpg_channel(1, 10, 100)
+        await settings.set_rpg_channel(2, 20, 200)
+        assert settings.rpg_channels == {1: 10, 2: 20}
+
+        await settings.remove_rpg_channel(10)
+        assert settings.rpg_channels == {2: 20}
+
+        reloaded = Settings()
+        await reloaded.load()
+        assert reloaded.rpg_channels == settings.rpg_channels
+
+    run(tmp_path, test)
+
+
+def test_load_reads_prefixes_and_whitelist(tmp_path):
+    async def test():
+        await db.execute_sql("INSERT INTO prefixes (guild_id, prefix) VALUES (?, ?)", (1, '?'))
+        await db.execute_many(
+            "INSERT INTO whitelist (location_id, role_id) VALUES (?, ?)", [(10, 100), (10, 101), (20, 200)]
+        )
+        settings = Settings()
+        await settings.load()
+        assert settings.prefixes == {1: '?'}
+        assert settings.whitelist == {10: {100, 101}, 20: {200}}
+
+    run(tmp_path, test)